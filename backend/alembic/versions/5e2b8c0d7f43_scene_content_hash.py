@@ -0,0 +1,33 @@
+"""scene content hash
+
+Revision ID: 5e2b8c0d7f43
+Revises: d4a97b3e5c21
+Create Date: 2026-10-19 13:05:51.827390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b8c0d7f43'
+down_revision: Union[str, Sequence[str], None] = 'd4a97b3e5c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # scene_files 는 seed 의 create_all 로 만들어지는 환경이 있어 존재할 때만 변경한다.
+    if sa.inspect(op.get_bind()).has_table('scene_files'):
+        op.add_column('scene_files', sa.Column('content_hash', sa.String(length=64), nullable=True))
+        op.create_index(op.f('ix_scene_files_content_hash'), 'scene_files', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('scene_files'):
+        op.drop_index(op.f('ix_scene_files_content_hash'), table_name='scene_files')
+        op.drop_column('scene_files', 'content_hash')
@@ -0,0 +1,29 @@
+"""element filter indexes
+
+Revision ID: 8c1f4e2a9b17
+Revises: 350347263bdd
+Create Date: 2026-10-19 10:12:04.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e2a9b17'
+down_revision: Union[str, Sequence[str], None] = '350347263bdd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_elements_type'), 'elements', ['type'], unique=False)
+    op.create_index(op.f('ix_elements_mass_gev'), 'elements', ['mass_gev'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_elements_mass_gev'), table_name='elements')
+    op.drop_index(op.f('ix_elements_type'), table_name='elements')
@@ -0,0 +1,50 @@
+"""render job retention rollup
+
+Revision ID: d4a97b3e5c21
+Revises: 8c1f4e2a9b17
+Create Date: 2026-10-19 11:40:27.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a97b3e5c21'
+down_revision: Union[str, Sequence[str], None] = '8c1f4e2a9b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('render_job_daily',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('scene_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('duration_hist', sa.JSON(), nullable=False),
+    sa.Column('p50_sec', sa.Float(), nullable=True),
+    sa.Column('p90_sec', sa.Float(), nullable=True),
+    sa.Column('p99_sec', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'scene_id', name='uq_render_job_daily_day_scene')
+    )
+    op.create_index(op.f('ix_render_job_daily_day'), 'render_job_daily', ['day'], unique=False)
+    op.create_index(op.f('ix_render_job_daily_scene_id'), 'render_job_daily', ['scene_id'], unique=False)
+    # render_jobs 는 seed 의 create_all 로 만들어지는 환경이 있어 존재할 때만 인덱스를 추가한다.
+    if sa.inspect(op.get_bind()).has_table('render_jobs'):
+        op.create_index('ix_render_jobs_status_updated_at', 'render_jobs', ['status', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('render_jobs'):
+        op.drop_index('ix_render_jobs_status_updated_at', table_name='render_jobs')
+    op.drop_index(op.f('ix_render_job_daily_scene_id'), table_name='render_job_daily')
+    op.drop_index(op.f('ix_render_job_daily_day'), table_name='render_job_daily')
+    op.drop_table('render_job_daily')
@@ -0,0 +1,34 @@
+import re
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.profiling import list_profiles, profiles_dir, verify_profile_token
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+_PROFILE_NAME_RE = re.compile(r"^[0-9T]+-[A-Z]+-[A-Za-z0-9_]+$")
+
+
+def require_profile_token(x_profile_token: str | None = Header(default=None)):
+    # 프로파일링이 꺼져 있으면 엔드포인트 자체를 숨긴다
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not verify_profile_token(x_profile_token):
+        raise HTTPException(status_code=403, detail="유효한 X-Profile-Token 이 필요합니다.")
+
+
+@router.get("/profiles", dependencies=[Depends(require_profile_token)])
+async def get_profiles(limit: int = 50):
+    return list_profiles(limit)
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_profile_token)])
+async def download_profile(name: str):
+    if not _PROFILE_NAME_RE.match(name):
+        raise HTTPException(status_code=404, detail="profile not found")
+    path = profiles_dir() / f"{name}.folded"
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="profile not found")
+    return FileResponse(path=path, media_type="text/plain", filename=path.name)
@@ -1,20 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, case, event
+from app.core.cache import response_cache
+from app.core.catalog import catalog_versions
 from app.core.db import get_session
 from app.db.models import Element
-from app.schemas.elements import ElementOut
+from app.schemas.elements import ElementOut, ElementFacetsOut, MassBucketOut
 
 router = APIRouter(prefix="/elements", tags=["elements"])
 
+# 질량 버킷 경계(GeV). 쿼크~원자~천체까지 자릿수 차이가 커서 로그 스케일로 나눈다.
+MASS_BUCKET_EDGES = [1e-3, 1.0, 1e3, 1e6]
+
+# facets 집계 캐시 (catalog_versions 의 elements 버전, 결과). 같은 프로세스에서 Element 가 바뀐 세션이
+# 커밋되면 비우고, import CLI 등 다른 프로세스의 변경은 버전이 달라진 것으로 감지한다.
+_facets_cache: tuple[tuple[int, ...], ElementFacetsOut] | None = None
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_elements_changed(session: Session, flush_context):
+    if any(isinstance(obj, Element) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["elements_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_facets(session: Session):
+    if session.info.pop("elements_changed", False):
+        invalidate_element_facets()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_elements_changed(session: Session):
+    session.info.pop("elements_changed", None)
+
+
+def invalidate_element_facets():
+    global _facets_cache
+    _facets_cache = None
+
+
+def _mass_bucket_expr():
+    whens = [(Element.mass_gev < edge, idx) for idx, edge in enumerate(MASS_BUCKET_EDGES)]
+    return case(*whens, else_=len(MASS_BUCKET_EDGES))
+
+
 @router.get("", response_model=list[ElementOut])
-async def list_elements(limit: int = 50, offset: int = 0, s: AsyncSession = Depends(get_session)):
-    q = select(Element).order_by(Element.name).limit(limit).offset(offset)
+async def list_elements(
+    limit: int = 50,
+    offset: int = 0,
+    type: str | None = Query(default=None, description="쉼표로 여러 개 지정 가능 (quark,atom)"),
+    mass_min: float | None = Query(default=None, description="mass_gev 하한(포함)"),
+    mass_max: float | None = Query(default=None, description="mass_gev 상한(포함)"),
+    genesis_time: str | None = Query(default=None, description="genesis_time 부분 일치"),
+    s: AsyncSession = Depends(get_session),
+):
+    q = select(Element)
+    if type:
+        types = [t.strip() for t in type.split(",") if t.strip()]
+        q = q.where(Element.type.in_(types))
+    if mass_min is not None:
+        q = q.where(Element.mass_gev >= mass_min)
+    if mass_max is not None:
+        q = q.where(Element.mass_gev <= mass_max)
+    if genesis_time:
+        q = q.where(Element.genesis_time.contains(genesis_time, autoescape=True))
+    q = q.order_by(Element.name).limit(limit).offset(offset)
     return (await s.execute(q)).scalars().all()
 
+@router.get("/facets", response_model=ElementFacetsOut)
+async def element_facets(s: AsyncSession = Depends(get_session)):
+    global _facets_cache
+    version = await catalog_versions.get(s, ("elements",))
+    if _facets_cache is not None and _facets_cache[0] == version:
+        return _facets_cache[1]
+
+    type_rows = (await s.execute(select(Element.type, func.count()).group_by(Element.type))).all()
+    bucket = _mass_bucket_expr().label("bucket")
+    bucket_rows = (await s.execute(
+        select(bucket, func.count()).where(Element.mass_gev.is_not(None)).group_by(bucket)
+    )).all()
+    unknown = await s.scalar(select(func.count()).select_from(Element).where(Element.mass_gev.is_(None)))
+
+    counts = dict(bucket_rows)
+    edges = [None, *MASS_BUCKET_EDGES, None]
+    facets = ElementFacetsOut(
+        total=sum(count for _, count in type_rows),
+        types={t: count for t, count in type_rows},
+        mass_buckets=[
+            MassBucketOut(min_gev=edges[i], max_gev=edges[i + 1], count=counts.get(i, 0))
+            for i in range(len(edges) - 1)
+        ],
+        mass_unknown=unknown or 0,
+    )
+    _facets_cache = (version, facets)
+    return facets
+
 @router.get("/{element_id}", response_model=ElementOut)
 async def get_element(element_id: int, s: AsyncSession = Depends(get_session)):
+    key = f"element:{element_id}"
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return cached
     el = await s.get(Element, element_id)
     if not el:
         raise HTTPException(404, "element not found")
-    return el
\ No newline at end of file
+    out = ElementOut.model_validate(el)
+    await response_cache.set(key, out.model_dump(mode="json"))
+    return out
@@ -1,28 +1,78 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+from app.core.cache import include_key, include_variants, response_cache
 from app.core.db import get_session
+from app.api.expand import parse_include
 from app.db.models import Epoch, Annotation
-from app.schemas.epochs import EpochOut, EpochDetailOut, AnnotationOut
+from app.schemas.epochs import EpochOut, AnnotationOut
+from app.schemas.events import CosmicEventOut
+from app.schemas.expand import EpochExpandedOut
 
 router = APIRouter(prefix="/epochs", tags=["epochs"])
 
-@router.get("", response_model=list[EpochOut])
-async def list_epochs(limit: int = 50, offset: int = 0, s: AsyncSession = Depends(get_session)):
+EPOCH_INCLUDES = {"annotations", "events"}
+
+
+def epoch_cache_keys(epoch_id: int) -> list[str]:
+    return include_variants(f"epoch:{epoch_id}", EPOCH_INCLUDES)
+
+
+def _epoch_out(ep: Epoch, include: set[str]) -> EpochExpandedOut:
+    # 로딩하지 않은 관계는 건드리지 않는다 (async 세션에서 lazy load 금지)
+    return EpochExpandedOut(
+        **EpochOut.model_validate(ep).model_dump(),
+        annotations=[AnnotationOut.model_validate(a) for a in ep.annotations] if "annotations" in include else None,
+        events=[CosmicEventOut.model_validate(e) for e in ep.events] if "events" in include else None,
+    )
+
+
+@router.get("", response_model=list[EpochExpandedOut])
+async def list_epochs(
+    limit: int = 50,
+    offset: int = 0,
+    include: str | None = None,
+    s: AsyncSession = Depends(get_session),
+):
+    expand = parse_include(include, EPOCH_INCLUDES)
     q = select(Epoch).order_by(Epoch.start_norm).limit(limit).offset(offset)
+    # 관계마다 IN (...) 쿼리 1회 — 페이지 크기와 무관
+    if "annotations" in expand:
+        q = q.options(selectinload(Epoch.annotations))
+    if "events" in expand:
+        q = q.options(selectinload(Epoch.events))
     rows = (await s.execute(q)).scalars().all()
-    return rows
+    return [_epoch_out(ep, expand) for ep in rows]
 
-@router.get("/{epoch_id}", response_model=EpochDetailOut)
-async def get_epoch(epoch_id: int, s: AsyncSession = Depends(get_session)):
-    ep = await s.get(Epoch, epoch_id)
+@router.get("/{epoch_id}", response_model=EpochExpandedOut)
+async def get_epoch(epoch_id: int, include: str | None = None, s: AsyncSession = Depends(get_session)):
+    # 상세는 annotations 를 항상 포함 (단일 행이므로 JOIN 으로 한 번에 로딩)
+    expand = parse_include(include, EPOCH_INCLUDES) | {"annotations"}
+    key = include_key(f"epoch:{epoch_id}", expand)
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return cached
+    q = select(Epoch).where(Epoch.id == epoch_id).options(joinedload(Epoch.annotations))
+    if "events" in expand:
+        q = q.options(selectinload(Epoch.events))
+    ep = (await s.execute(q)).unique().scalar_one_or_none()
     if not ep:
         raise HTTPException(404, "epoch not found")
-    # 관계 로딩 (annotations)
-    await s.refresh(ep, attribute_names=["annotations"])
-    return ep
+    out = _epoch_out(ep, expand)
+    await response_cache.set(key, out.model_dump(mode="json"))
+    return out
+
+async def prime_epoch_cache(s: AsyncSession, limit: int) -> int:
+    """앞쪽 limit 개 에폭의 기본 상세 응답(GET /epochs/{id})을 응답 캐시에 미리 넣는다. 넣은 개수를 반환."""
+    expand = {"annotations"}
+    q = select(Epoch).order_by(Epoch.start_norm).limit(limit).options(selectinload(Epoch.annotations))
+    rows = (await s.execute(q)).scalars().all()
+    for ep in rows:
+        await response_cache.set(include_key(f"epoch:{ep.id}", expand), _epoch_out(ep, expand).model_dump(mode="json"))
+    return len(rows)
 
 @router.get("/{epoch_id}/annotations", response_model=list[AnnotationOut])
 async def list_annotations(epoch_id: int, s: AsyncSession = Depends(get_session)):
     q = select(Annotation).where(Annotation.epoch_id == epoch_id).order_by(Annotation.time_mark)
-    return (await s.execute(q)).scalars().all()
\ No newline at end of file
+    return (await s.execute(q)).scalars().all()
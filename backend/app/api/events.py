@@ -1,28 +1,129 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import RedirectResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.core.cache import include_key, include_variants, response_cache
 from app.core.db import get_session
-from app.api.renders import enqueue_render_job, get_or_create_placeholder_scene
-from app.db.models import CosmicEvent, SceneFile, RenderJob
-from app.schemas.events import CosmicEventOut, CosmicEventDetail
-from app.schemas.renders import RenderJobOut
+from app.api.expand import parse_include
+from app.api.renders import enqueue_render_job, get_or_create_placeholder_scene, get_placeholder_scene, scene_thumbnail_hash
+from app.api.thumbnails import check_thumbnail_params
+from app.db.models import CosmicEvent, SceneFile, RenderJob, Epoch
+from app.schemas.epochs import EpochOut, AnnotationOut
+from app.schemas.events import CosmicEventDetail
+from app.schemas.expand import CosmicEventExpandedOut, CosmicEventExpandedDetail
+from app.schemas.renders import RenderJobOut, SceneOut
 
 router = APIRouter(prefix="/events", tags=["events"])
 
-
-@router.get("", response_model=list[CosmicEventOut])
-async def list_events(limit: int = 50, offset: int = 0, s: AsyncSession = Depends(get_session)):
-    q = select(CosmicEvent).order_by(CosmicEvent.time_norm).limit(limit).offset(offset)
-    return (await s.execute(q)).scalars().all()
-
-
-@router.get("/{event_id}", response_model=CosmicEventDetail)
-async def get_event(event_id: int, s: AsyncSession = Depends(get_session)):
+# scene 은 이벤트의 default_scene 을 의미한다.
+EVENT_INCLUDES = {"epoch", "annotations", "scene"}
+
+
+def event_cache_keys(event_id: int) -> list[str]:
+    return include_variants(f"event:{event_id}", EVENT_INCLUDES)
+
+
+def _event_query(expand: set[str]):
+    # 관계마다 IN (...) 쿼리 1회 — 페이지 크기와 무관
+    q = select(CosmicEvent)
+    if "annotations" in expand:
+        q = q.options(selectinload(CosmicEvent.epoch).selectinload(Epoch.annotations))
+    elif "epoch" in expand:
+        q = q.options(selectinload(CosmicEvent.epoch))
+    if "scene" in expand:
+        q = q.options(selectinload(CosmicEvent.default_scene))
+    return q
+
+
+def _event_out(ev: CosmicEvent, expand: set[str], model=CosmicEventExpandedOut):
+    # 로딩하지 않은 관계는 건드리지 않는다 (async 세션에서 lazy load 금지)
+    data = CosmicEventDetail.model_validate(ev).model_dump()
+    if "epoch" in expand:
+        data["epoch"] = EpochOut.model_validate(ev.epoch) if ev.epoch else None
+    if "annotations" in expand:
+        data["annotations"] = [AnnotationOut.model_validate(a) for a in ev.epoch.annotations] if ev.epoch else []
+    if "scene" in expand:
+        data["scene"] = SceneOut.model_validate(ev.default_scene) if ev.default_scene else None
+    return model.model_validate(data)
+
+
+@router.get("", response_model=list[CosmicEventExpandedOut])
+async def list_events(
+    limit: int = 50,
+    offset: int = 0,
+    include: str | None = None,
+    s: AsyncSession = Depends(get_session),
+):
+    expand = parse_include(include, EVENT_INCLUDES)
+    q = _event_query(expand).order_by(CosmicEvent.time_norm).limit(limit).offset(offset)
+    rows = (await s.execute(q)).scalars().all()
+    return [_event_out(ev, expand) for ev in rows]
+
+
+@router.get("/{event_id}", response_model=CosmicEventExpandedDetail)
+async def get_event(event_id: int, include: str | None = None, s: AsyncSession = Depends(get_session)):
+    expand = parse_include(include, EVENT_INCLUDES)
+    key = include_key(f"event:{event_id}", expand)
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return cached
+    q = _event_query(expand).where(CosmicEvent.id == event_id)
+    ev = (await s.execute(q)).scalar_one_or_none()
+    if not ev:
+        raise HTTPException(status_code=404, detail="event not found")
+    out = _event_out(ev, expand, CosmicEventExpandedDetail)
+    await response_cache.set(key, out.model_dump(mode="json"))
+    return out
+
+
+async def prime_event_cache(s: AsyncSession, limit: int) -> int:
+    """앞쪽 limit 개 이벤트의 기본 상세 응답(GET /events/{id})을 응답 캐시에 미리 넣는다. 넣은 개수를 반환."""
+    expand: set[str] = set()
+    q = _event_query(expand).order_by(CosmicEvent.time_norm).limit(limit)
+    rows = (await s.execute(q)).scalars().all()
+    for ev in rows:
+        out = _event_out(ev, expand, CosmicEventExpandedDetail)
+        await response_cache.set(include_key(f"event:{ev.id}", expand), out.model_dump(mode="json"))
+    return len(rows)
+
+
+@router.get("/{event_id}/thumbnail")
+async def get_event_thumbnail(event_id: int, size: int = 128, format: str = "webp", s: AsyncSession = Depends(get_session)):
+    """이벤트 카드 썸네일. 내용 해시 기반의 immutable URL(/thumbnails/...)로 리다이렉트합니다."""
+    check_thumbnail_params(size, format)
     ev = await s.get(CosmicEvent, event_id)
     if not ev:
         raise HTTPException(status_code=404, detail="event not found")
-    return ev
+
+    # 읽기 전용: placeholder 씬을 만들지 않고, 매핑된 씬이 없으면 기존 placeholder 만 본다
+    scene = await _find_scene_for_event(s, ev, None) or await get_placeholder_scene(s)
+    if not scene:
+        raise HTTPException(status_code=404, detail="썸네일이 아직 없습니다.")
+    # 이 이벤트 시점의 완료된 렌더 썸네일이 있으면 우선, 없으면 씬 프리뷰
+    q = (
+        select(RenderJob)
+        .where(RenderJob.scene_id == scene.id, RenderJob.status == "done", RenderJob.time_norm == ev.time_norm)
+        .order_by(RenderJob.id.desc())
+        .limit(10)
+    )
+    content_hash = next(
+        (job.params["thumbnail"] for job in (await s.execute(q)).scalars() if (job.params or {}).get("thumbnail")),
+        None,
+    )
+    if not content_hash:
+        # 블렌더 렌더는 업로드/렌더 백그라운드 작업에서만 — GET 에서는 이미 있는 것만 쓴다
+        content_hash = scene_thumbnail_hash(scene)
+    if not content_hash:
+        raise HTTPException(status_code=404, detail="썸네일이 아직 없습니다.")
+
+    # 씬이 다시 매핑될 수 있으므로 리다이렉트 자체는 짧게만 캐시
+    return RedirectResponse(
+        url=f"/thumbnails/{content_hash}/{size}.{format}",
+        status_code=307,
+        headers={"Cache-Control": "public, max-age=60"},
+    )
 
 
 @router.post("/{event_id}/render", response_model=RenderJobOut, status_code=201)
@@ -57,6 +158,12 @@ async def render_event(event_id: int, scene_id: int | None = None, s: AsyncSessi
 # 이벤트 제목별로 씬을 자동 매핑한다.
 # 사용자가 scene_id를 주면 우선 사용하고, 없으면 제목 기반 매핑 → default_scene → placeholder 순.
 async def _resolve_scene_for_event(session: AsyncSession, ev: CosmicEvent, scene_id: int | None) -> SceneFile:
+    scene = await _find_scene_for_event(session, ev, scene_id)
+    # 아무것도 없으면 placeholder
+    return scene or await get_or_create_placeholder_scene(session)
+
+
+async def _find_scene_for_event(session: AsyncSession, ev: CosmicEvent, scene_id: int | None) -> SceneFile | None:
     if scene_id:
         scene = await session.get(SceneFile, scene_id)
         if scene:
@@ -87,6 +194,4 @@ async def _resolve_scene_for_event(session: AsyncSession, ev: CosmicEvent, scene
         scene = await session.get(SceneFile, ev.default_scene_id)
         if scene:
             return scene
-
-    # 아무것도 없으면 placeholder
-    return await get_or_create_placeholder_scene(session)
+    return None
@@ -0,0 +1,15 @@
+from fastapi import HTTPException
+
+
+def parse_include(include: str | None, allowed: set[str], name: str = "include") -> set[str]:
+    """`include=annotations,events` 형태의 확장 파라미터를 파싱합니다. 허용되지 않은 값은 400."""
+    if not include:
+        return set()
+    requested = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 {name} 값: {', '.join(sorted(unknown))} (가능: {', '.join(sorted(allowed))})",
+        )
+    return requested
@@ -1,26 +1,37 @@
 import asyncio
+import hashlib
+import shutil
 import subprocess
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import FileResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import render_job_key, response_cache
 from app.core.config import settings
 from app.core.db import get_session, SessionLocal
-from app.core.storage import ensure_subdir
-from app.db.models import SceneFile, RenderJob, Epoch
-from app.schemas.renders import SceneOut, RenderJobOut, RenderJobCreate
+from app.core.glb import inspect_glb
+from app.core.storage import ensure_subdir, file_sha256
+from app.core.textures import optimize_glb_textures
+from app.core.thumbnails import PREVIEW_SIZE, has_thumbnails, make_thumbnails, thumbnail_path
+from app.db.models import SceneFile, RenderJob, Epoch, RenderJobDaily, RENDER_FINISHED_STATUSES
+from app.schemas.renders import SceneOut, RenderJobOut, RenderJobCreate, RenderManifestOut, RenderDailyOut
 
 router = APIRouter(prefix="/renders", tags=["renders"])
 
 
-async def get_or_create_placeholder_scene(session: AsyncSession) -> SceneFile:
+async def get_placeholder_scene(session: AsyncSession) -> SceneFile | None:
     q = select(SceneFile).where(SceneFile.name == "Placeholder Scene")
-    existing = (await session.execute(q)).scalar_one_or_none()
+    return (await session.execute(q)).scalar_one_or_none()
+
+
+async def get_or_create_placeholder_scene(session: AsyncSession) -> SceneFile:
+    existing = await get_placeholder_scene(session)
     if existing:
         return existing
 
@@ -40,7 +51,7 @@ async def get_or_create_placeholder_scene(session: AsyncSession) -> SceneFile:
     return scene
 
 
-async def _save_scene_file(file: UploadFile, name_override: str | None) -> tuple[str, Path, int]:
+async def _save_scene_file(file: UploadFile, name_override: str | None) -> tuple[str, Path, int, str]:
     if not file.filename:
         raise HTTPException(status_code=400, detail="파일 이름이 비어 있습니다.")
 
@@ -53,7 +64,127 @@ async def _save_scene_file(file: UploadFile, name_override: str | None) -> tuple
     dest_dir = ensure_subdir("scenes")
     dest_path = dest_dir / f"{uuid4().hex}{ext}"
     await asyncio.to_thread(dest_path.write_bytes, data)
-    return scene_name, dest_path, len(data)
+    return scene_name, dest_path, len(data), hashlib.sha256(data).hexdigest()
+
+
+async def scene_content_hash(session: AsyncSession, scene: SceneFile) -> str | None:
+    """씬 파일의 sha256. 업로드 시 기록되지 않은 기존 행은 처음 필요할 때 계산해 저장합니다."""
+    if scene.content_hash:
+        return scene.content_hash
+    path = Path(scene.file_path)
+    if not path.exists():
+        return None
+    scene.content_hash = await asyncio.to_thread(file_sha256, path)
+    await session.commit()
+    return scene.content_hash
+
+
+def _recently_failed(marker: Path) -> bool:
+    """실패 마커가 BLENDER_FAILURE_TTL_SEC 안에 남겨졌으면 True (그 뒤에는 다시 시도)."""
+    try:
+        return time.time() - marker.stat().st_mtime < settings.BLENDER_FAILURE_TTL_SEC
+    except FileNotFoundError:
+        return False
+
+
+def _mark_failed(marker: Path, reason: str):
+    # 블렌더를 찾을 수 없는 건 씬 내용 문제가 아니라 환경 문제라 마커를 남기지 않는다 (설치 후 바로 재시도).
+    if shutil.which(settings.BLENDER_BIN or "blender") is None:
+        print(f"Blender not found ({settings.BLENDER_BIN or 'blender'}); not marking {marker.name} as failed")
+        return
+    marker.write_text(reason)
+
+
+_thumbnail_locks: dict[str, asyncio.Lock] = {}
+
+
+async def ensure_scene_thumbnails(session: AsyncSession, scene: SceneFile) -> str | None:
+    """씬 프리뷰 썸네일을 (없으면 블렌더 저샘플 렌더로) 만들고 캐시 키(씬 해시)를 반환합니다.
+    업로드/렌더 백그라운드 경로에서만 호출합니다 — 씬 내용 해시당 한 번만 렌더하고, 실패하면
+    `.failed` 마커를 남겨 BLENDER_FAILURE_TTL_SEC 동안은 같은 내용으로 다시 블렌더를 띄우지 않습니다."""
+    content_hash = await scene_content_hash(session, scene)
+    if not content_hash:
+        return None
+    if has_thumbnails(content_hash):
+        return content_hash
+
+    preview_path = thumbnail_path(content_hash, PREVIEW_SIZE, "png").with_name("preview.png")
+    failed_marker = preview_path.with_suffix(".failed")
+    async with _thumbnail_locks.setdefault(content_hash, asyncio.Lock()):
+        if has_thumbnails(content_hash):
+            return content_hash
+        if _recently_failed(failed_marker):
+            return None
+        preview_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if not preview_path.exists() and not await _render_preview_with_blender(Path(scene.file_path), preview_path):
+                raise RuntimeError("preview render failed")
+            await asyncio.to_thread(make_thumbnails, preview_path, content_hash)
+        except Exception as exc:
+            print(f"Scene thumbnail generation failed for {content_hash[:16]}: {exc}")
+            _mark_failed(failed_marker, "thumbnail failed")
+            return None
+    return content_hash
+
+
+def scene_thumbnail_hash(scene: SceneFile) -> str | None:
+    """이미 만들어진 씬 프리뷰 썸네일의 캐시 키. 없으면 None.
+    GET 경로용이라 저장된 content_hash 만 보고 해시 계산/DB 쓰기는 하지 않습니다."""
+    if scene.content_hash and has_thumbnails(scene.content_hash):
+        return scene.content_hash
+    return None
+
+
+def _baked_scene_path(scene_path: Path, content_hash: str) -> Path:
+    # 내용 해시가 파일명에 들어가므로 씬이 다시 업로드되면(해시 변경) 예전 베이크는 자동으로 쓰이지 않는다.
+    # v2: 아마추어/파티클/인스턴스는 남기는 베이크. 이전 형식(모두 적용)은 정리 glob 에 걸려 지워진다.
+    return scene_path.with_name(f"{scene_path.stem}.baked-v2-{content_hash[:16]}.blend")
+
+
+_bake_locks: dict[str, asyncio.Lock] = {}
+
+
+async def ensure_baked_scene(session: AsyncSession, scene: SceneFile) -> Path | None:
+    """모디파이어를 미리 적용한 .blend 를 씬 내용 해시당 한 번만 만들고 경로를 반환합니다.
+    베이크를 끈 경우나 실패한 경우 None (원본 + export_apply 로 익스포트)."""
+    if not settings.SCENE_BAKE_ENABLED:
+        return None
+    content_hash = await scene_content_hash(session, scene)
+    if not content_hash:
+        return None
+    scene_path = Path(scene.file_path)
+    baked_path = _baked_scene_path(scene_path, content_hash)
+    failed_marker = baked_path.with_suffix(".failed")
+
+    async with _bake_locks.setdefault(content_hash, asyncio.Lock()):
+        if baked_path.exists():
+            return baked_path
+        # 같은 내용으로 최근에 실패했다면 매 익스포트마다 다시 시도하지 않는다.
+        if _recently_failed(failed_marker):
+            return None
+        for stale in scene_path.parent.glob(f"{scene_path.stem}.baked-*"):
+            stale.unlink(missing_ok=True)
+        if await _bake_scene_with_blender(scene_path, baked_path):
+            return baked_path
+        _mark_failed(failed_marker, "bake failed")
+        return None
+
+
+async def _ensure_job_thumbnails(session: AsyncSession, job: RenderJob, scene: SceneFile) -> str | None:
+    # PNG 결과물이면 그 이미지로, 아니면(GLB) 씬 프리뷰로 썸네일을 만든다.
+    output = Path(job.output_path) if job.output_path else None
+    if output and output.suffix.lower() == ".png" and output.exists():
+        content_hash = await asyncio.to_thread(file_sha256, output)
+        await asyncio.to_thread(make_thumbnails, output, content_hash)
+        return content_hash
+    return await ensure_scene_thumbnails(session, scene)
+
+
+async def _generate_scene_thumbnails(scene_id: int):
+    async with SessionLocal() as session:
+        scene = await session.get(SceneFile, scene_id)
+        if scene:
+            await ensure_scene_thumbnails(session, scene)
 
 
 async def enqueue_render_job(job_id: int):
@@ -66,6 +197,7 @@ async def enqueue_render_job(job_id: int):
         job.message = "GLTF(.glb) 변환 준비"
         job.updated_at = datetime.utcnow()
         await session.commit()
+        await response_cache.delete(render_job_key(job.id))
 
         render_dir = ensure_subdir("renders")
         scene = await session.get(SceneFile, job.scene_id)
@@ -75,9 +207,25 @@ async def enqueue_render_job(job_id: int):
             job.message = f"원본 Scene 파일(id:{job.scene_id})을 찾을 수 없습니다."
             job.updated_at = datetime.utcnow()
             await session.commit()
+            await response_cache.delete(render_job_key(job.id))
             return
 
-        export_ok, output_path = await _export_glb_with_blender(job, scene, render_dir)
+        baked_path = await ensure_baked_scene(session, scene)
+        export_ok, output_path = await _export_glb_with_blender(job, scene, render_dir, baked_path)
+
+        if export_ok and output_path and output_path.suffix.lower() == ".glb" and settings.TEXTURE_MAX_SIZE > 0:
+            job.message = "텍스처 최적화"
+            job.updated_at = datetime.utcnow()
+            await session.commit()
+            await response_cache.delete(render_job_key(job.id))
+            try:
+                textures = await asyncio.to_thread(optimize_glb_textures, output_path)
+            except Exception as exc:
+                # 선택 단계라 어떤 실패든 렌더 실패로 만들지 않는다 — 원본 GLB 를 그대로 제공
+                # (write_glb 는 임시 파일 후 교체하므로 실패해도 원본은 온전하다)
+                print(f"Texture optimization failed for job {job.id}: {type(exc).__name__}: {exc}")
+            else:
+                job.params = {**(job.params or {}), "textures": textures}
 
         if export_ok and output_path:
             job.status = "done"
@@ -89,24 +237,40 @@ async def enqueue_render_job(job_id: int):
 
         job.updated_at = datetime.utcnow()
         await session.commit()
+        await response_cache.delete(render_job_key(job.id))
+
+        if job.status == "done":
+            try:
+                thumb = await _ensure_job_thumbnails(session, job, scene)
+            except Exception as exc:
+                print(f"Thumbnail generation failed for job {job.id}: {exc}")
+                thumb = None
+            if thumb:
+                job.params = {**(job.params or {}), "thumbnail": thumb}
+                await session.commit()
+                await response_cache.delete(render_job_key(job.id))
 
 
 @router.post("/scenes", response_model=SceneOut)
 async def upload_scene(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     name: str | None = Form(default=None),
     s: AsyncSession = Depends(get_session),
 ):
-    scene_name, dest_path, size = await _save_scene_file(file, name)
+    scene_name, dest_path, size, content_hash = await _save_scene_file(file, name)
     scene = SceneFile(
         name=scene_name,
         original_name=file.filename,
         file_path=str(dest_path),
         file_size=size,
+        content_hash=content_hash,
     )
     s.add(scene)
     await s.commit()
     await s.refresh(scene)
+    # 프리뷰 렌더는 블렌더를 띄우므로 응답 후 처리
+    background_tasks.add_task(_generate_scene_thumbnails, scene.id)
     return scene
 
 
@@ -159,11 +323,30 @@ async def list_render_jobs(limit: int = 50, offset: int = 0, s: AsyncSession = D
     return (await s.execute(q)).scalars().all()
 
 
+@router.get("/history", response_model=list[RenderDailyOut])
+async def list_render_history(scene_id: int | None = None, days: int = 30, s: AsyncSession = Depends(get_session)):
+    """보존 기간 정리로 아카이브된 Job 의 일자·씬별 집계 (최근 일자순)."""
+    since = datetime.utcnow().date() - timedelta(days=days)
+    q = select(RenderJobDaily).where(RenderJobDaily.day >= since)
+    if scene_id is not None:
+        q = q.where(RenderJobDaily.scene_id == scene_id)
+    q = q.order_by(RenderJobDaily.day.desc(), RenderJobDaily.scene_id)
+    return (await s.execute(q)).scalars().all()
+
+
 @router.get("/{job_id}", response_model=RenderJobOut)
 async def get_render_job(job_id: int, s: AsyncSession = Depends(get_session)):
+    key = render_job_key(job_id)
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return cached
     job = await s.get(RenderJob, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="render job not found")
+    # done/failed 는 더 바뀌지 않으므로 공유 캐시에는 만료 없이 둔다 (로컬 사본은 CACHE_TTL_SEC 이내로 제한,
+    # 후처리로 params 가 바뀌면 명시적으로 무효화)
+    if job.status in RENDER_FINISHED_STATUSES:
+        await response_cache.set(key, RenderJobOut.model_validate(job).model_dump(mode="json"), ttl=None)
     return job
 
 
@@ -188,10 +371,47 @@ async def download_render_file(job_id: int, s: AsyncSession = Depends(get_sessio
     return FileResponse(path=path, media_type=media_type, filename=path.name)
 
 
-async def _export_glb_with_blender(job: RenderJob, scene: SceneFile, render_dir: Path) -> tuple[bool, Path | None]:
-    """Blender CLI를 호출하여 .glb 파일을 익스포트합니다. 성공 시 (True, output_path), 실패 시 (False, None)"""
+@router.get("/{job_id}/manifest", response_model=RenderManifestOut)
+async def get_render_manifest(job_id: int, s: AsyncSession = Depends(get_session)):
+    """GLB 를 내려받기 전에 카메라 프레이밍/LOD 선택용 메타데이터를 제공합니다. 결과는 job.params 에 캐시."""
+    job = await s.get(RenderJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="render job not found")
+    if job.status != "done" or not job.output_path:
+        raise HTTPException(status_code=400, detail="렌더가 아직 완료되지 않았습니다.")
+
+    path = Path(job.output_path)
+    if path.suffix.lower() != ".glb":
+        raise HTTPException(status_code=400, detail="GLB 결과물만 manifest 를 제공합니다.")
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="결과 파일을 찾을 수 없습니다.")
+
+    # 파일이 다시 쓰였으면(크기 변경) 캐시를 무시하고 다시 계산
+    cached = (job.params or {}).get("manifest")
+    if cached and cached.get("byte_size") == path.stat().st_size:
+        return RenderManifestOut(job_id=job.id, **cached)
+
+    try:
+        manifest = await asyncio.to_thread(inspect_glb, path)
+    except (ValueError, OSError) as exc:
+        raise HTTPException(status_code=422, detail=f"GLB 파싱 실패: {exc}")
+
+    # JSON 컬럼은 새 dict 로 교체해야 변경이 감지된다.
+    job.params = {**(job.params or {}), "manifest": manifest}
+    await s.commit()
+    await response_cache.delete(render_job_key(job.id))
+    return RenderManifestOut(job_id=job.id, **manifest)
+
+
+async def _export_glb_with_blender(
+    job: RenderJob, scene: SceneFile, render_dir: Path, baked_path: Path | None = None
+) -> tuple[bool, Path | None]:
+    """Blender CLI를 호출하여 .glb 파일을 익스포트합니다. 성공 시 (True, output_path), 실패 시 (False, None)
+    baked_path 가 주어지면 베이크 파일을 엽니다. 베이크에서 남겨 둔 모디파이어(아마추어, 파티클,
+    인스턴스를 만드는 오브젝트)가 있으므로 export_apply 는 그대로 켜 두고, 적용이 끝난 오브젝트는
+    모디파이어가 없어 재평가 비용이 들지 않습니다."""
     blender_bin = settings.BLENDER_BIN or "blender"
-    scene_path = Path(scene.file_path).resolve()
+    scene_path = (baked_path or Path(scene.file_path)).resolve()
     render_dir = render_dir.resolve()
     output_path = render_dir / f"{job.id}.glb"
     
@@ -245,3 +465,70 @@ async def _export_glb_with_blender(job: RenderJob, scene: SceneFile, render_dir:
         print(f"An unexpected error occurred during Blender export for job {job.id}: {exc}")
         
     return False, None
+
+
+async def _render_preview_with_blender(scene_path: Path, output_path: Path) -> bool:
+    """Blender CLI로 씬의 저샘플(Workbench) 프리뷰 PNG를 렌더합니다."""
+    blender_bin = settings.BLENDER_BIN or "blender"
+    scene_path = scene_path.resolve()
+    preview_script_path = Path(__file__).parent.parent / "core" / "render_preview.py"
+
+    if not scene_path.exists():
+        print(f"Blender preview failed: Scene file not found at {scene_path}")
+        return False
+
+    cmd = [
+        blender_bin,
+        "-b",
+        str(scene_path),
+        "--python",
+        str(preview_script_path),
+        "--",
+        str(output_path.resolve()),
+        str(PREVIEW_SIZE),
+    ]
+
+    try:
+        print(f"Executing Blender preview command: {' '.join(cmd)}")
+        await asyncio.to_thread(subprocess.run, cmd, check=True, capture_output=True, text=True)
+        return output_path.exists()
+    except subprocess.CalledProcessError as exc:
+        print(f"Blender preview subprocess failed with exit code {exc.returncode}")
+        print(f"  stderr: {exc.stderr}")
+    except Exception as exc:
+        print(f"An unexpected error occurred during Blender preview: {exc}")
+    return False
+
+
+async def _bake_scene_with_blender(scene_path: Path, baked_path: Path) -> bool:
+    """Blender CLI로 모디파이어를 적용한 베이크 .blend 를 만듭니다. 임시 파일에 쓴 뒤 교체."""
+    blender_bin = settings.BLENDER_BIN or "blender"
+    bake_script_path = Path(__file__).parent.parent / "core" / "bake_scene.py"
+    tmp_path = baked_path.with_name(f".{uuid4().hex}.blend")
+
+    cmd = [
+        blender_bin,
+        "-b",
+        str(scene_path.resolve()),
+        "--python",
+        str(bake_script_path),
+        "--",
+        str(tmp_path.resolve()),
+    ]
+
+    try:
+        print(f"Executing Blender bake command: {' '.join(cmd)}")
+        await asyncio.to_thread(subprocess.run, cmd, check=True, capture_output=True, text=True)
+        if not tmp_path.exists():
+            print("Blender bake failed: Output file not found after execution.")
+            return False
+        tmp_path.replace(baked_path)
+        return True
+    except subprocess.CalledProcessError as exc:
+        print(f"Blender bake subprocess failed with exit code {exc.returncode}")
+        print(f"  stderr: {exc.stderr}")
+    except Exception as exc:
+        print(f"An unexpected error occurred during Blender bake: {exc}")
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return False
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_session
+from app.core.search import search_index
+from app.api.expand import parse_include
+from app.schemas.search import SearchHitOut
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SEARCH_TYPES = {"event", "annotation", "element"}
+
+
+@router.get("", response_model=list[SearchHitOut])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: str | None = Query(default=None, description="event,annotation,element 중 쉼표 구분"),
+    limit: int = Query(default=20, ge=1, le=100),
+    s: AsyncSession = Depends(get_session),
+):
+    kinds = parse_include(type, SEARCH_TYPES, name="type")
+    # 최초 1회만 DB 에서 색인을 만들고, 이후에는 커밋 훅으로 증분 반영된다.
+    await search_index.ensure_built(s)
+    return [
+        SearchHitOut(type=doc.kind, id=doc.id, title=doc.title, score=round(score, 4), time_norm=doc.time_norm)
+        for doc, score in search_index.search(q, limit=limit, kinds=kinds)
+    ]
@@ -0,0 +1,35 @@
+import re
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.thumbnails import THUMBNAIL_FORMATS, THUMBNAIL_SIZES, thumbnail_path
+
+router = APIRouter(prefix="/thumbnails", tags=["thumbnails"])
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# 경로에 내용 해시가 들어가므로 한 번 받은 썸네일은 다시 검증할 필요가 없다.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+def check_thumbnail_params(size: int, fmt: str):
+    if size not in THUMBNAIL_SIZES:
+        raise HTTPException(status_code=400, detail=f"size 는 {', '.join(map(str, THUMBNAIL_SIZES))} 중 하나여야 합니다.")
+    if fmt not in THUMBNAIL_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format 은 {', '.join(THUMBNAIL_FORMATS)} 중 하나여야 합니다.")
+
+
+@router.get("/{content_hash}/{size}.{fmt}")
+async def get_thumbnail(content_hash: str, size: int, fmt: str):
+    if not _HASH_RE.match(content_hash):
+        raise HTTPException(status_code=404, detail="thumbnail not found")
+    check_thumbnail_params(size, fmt)
+    path = thumbnail_path(content_hash, size, fmt)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="thumbnail not found")
+    return FileResponse(
+        path=path,
+        media_type=THUMBNAIL_FORMATS[fmt],
+        headers={"Cache-Control": IMMUTABLE_CACHE, "ETag": f'"{content_hash}-{size}-{fmt}"'},
+    )
@@ -0,0 +1,99 @@
+import bpy
+import sys
+import os
+
+# Modifiers that must stay live: armatures drive animation (the glTF exporter exports skins),
+# particle systems produce instances that a mesh cannot hold.
+SKIP_MODIFIER_TYPES = {'ARMATURE', 'PARTICLE_SYSTEM'}
+
+
+def _instancer_names(depsgraph):
+    """Names of objects whose evaluated geometry spawns instances (geometry nodes, particles, dupli)."""
+    names = set()
+    for inst in depsgraph.object_instances:
+        if inst.is_instance and inst.parent is not None:
+            names.add(inst.parent.original.name)
+    return names
+
+
+def _bake_object(obj):
+    """Applies the leading modifiers of obj one at a time with modifier_apply.
+
+    Stops at the first modifier that must stay live, since anything below it depends on
+    its result. Returns the number of applied modifiers.
+    """
+    if obj.data.users > 1:
+        # modifier_apply refuses multi-user data; give this object its own copy
+        obj.data = obj.data.copy()
+
+    applied = 0
+    with bpy.context.temp_override(object=obj, active_object=obj, selected_objects=[obj], selected_editable_objects=[obj]):
+        for mod in list(obj.modifiers):
+            if mod.type in SKIP_MODIFIER_TYPES:
+                break
+            if not mod.show_viewport:
+                # Disabled modifiers do not change the evaluated mesh; leave them in place
+                continue
+            name = mod.name
+            try:
+                bpy.ops.object.modifier_apply(modifier=name)
+            except RuntimeError as e:
+                print(f"Keeping modifier '{name}' on '{obj.name}': {e}", file=sys.stderr)
+                break
+            applied += 1
+    return applied
+
+
+def bake_scene(output_path):
+    """Applies modifier stacks (subdivision, geometry nodes, ...) and saves a copy of the .blend.
+
+    Baked meshes let later glTF exports skip modifier evaluation. Armature and particle
+    system modifiers (and everything stacked below them) stay live, and objects whose
+    evaluated geometry has instances or that have shape keys are left untouched; the
+    exporter's export_apply still handles those. Results are frozen at the current frame.
+    """
+    try:
+        output_dir = os.path.dirname(output_path)
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        if bpy.context.object and bpy.context.object.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        instancers = _instancer_names(bpy.context.evaluated_depsgraph_get())
+        baked = skipped = 0
+        for obj in list(bpy.context.view_layer.objects):
+            if obj.type != 'MESH' or not obj.modifiers:
+                continue
+            if obj.name in instancers or obj.data.shape_keys or obj.library or obj.data.library:
+                skipped += 1
+                continue
+            if _bake_object(obj):
+                baked += 1
+
+        bpy.ops.wm.save_as_mainfile(filepath=output_path, copy=True, compress=False)
+        print(f"Successfully baked {baked} objects ({skipped} skipped) to {output_path}")
+        return True
+    except Exception as e:
+        print(f"Error baking scene: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc(file=sys.stderr)
+        return False
+
+if __name__ == "__main__":
+    # Example: blender my_scene.blend --python bake_scene.py -- /path/to/my_scene.baked.blend
+    argv = sys.argv
+    try:
+        if "--" in argv:
+            args = argv[argv.index("--") + 1:]
+            if not args:
+                raise ValueError("No output path provided.")
+            output_filepath = args[0]
+            if not bake_scene(output_filepath):
+                sys.exit(1)
+        else:
+            raise ValueError("Separator '--' not found in arguments.")
+    except ValueError as err:
+        print(f"Argument error: {err}", file=sys.stderr)
+        print("Usage: blender <blend_file> --python bake_scene.py -- <output_path.blend>", file=sys.stderr)
+        sys.exit(1)
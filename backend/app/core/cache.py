@@ -0,0 +1,206 @@
+"""GET 응답 캐시 (프로세스 내 LRU + 선택적 공유 Redis 계층).
+
+- 1차: 워커 프로세스마다 갖는 LRU. 공유 계층이 있으면 다른 워커의 무효화를 볼 수 없으므로
+  `CACHE_LOCAL_TTL_SEC` 로 짧게만 보관한다.
+- 2차: `CACHE_URL`(redis://host:port/db) 이 설정되면 Redis 프로토콜(RESP) 서버를 공유 계층으로 사용.
+  의존성을 늘리지 않으려고 GET/SET/DEL 만 하는 최소 클라이언트를 둔다. 연결 실패 시 캐시 미스로 취급.
+
+값은 JSON 으로 직렬화 가능한 dict 여야 한다. ttl=None 은 공유 계층에서 만료 없음(완료된 렌더 Job 처럼 불변인 값).
+로컬 LRU 사본은 항상 만료된다(공유 계층이 있으면 `CACHE_LOCAL_TTL_SEC`, 없으면 `CACHE_TTL_SEC`).
+"""
+import asyncio
+import itertools
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+
+class CacheUnavailable(Exception):
+    pass
+
+
+class RespClient:
+    """Redis 프로토콜 최소 클라이언트 (단일 커넥션, 요청 직렬화)."""
+
+    RETRY_AFTER_SEC = 5.0
+
+    def __init__(self, url: str, timeout: float = 0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+        self._down_until = 0.0
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._roundtrip("AUTH", self.password)
+        if self.db:
+            await self._roundtrip("SELECT", str(self.db))
+
+    def _close(self):
+        if self._writer:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(out)
+
+    async def _read_reply(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise CacheUnavailable(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            data = await self._reader.readexactly(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            size = int(payload)
+            return None if size < 0 else [await self._read_reply() for _ in range(size)]
+        raise ConnectionError(f"unexpected reply: {line!r}")
+
+    async def _roundtrip(self, *args):
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def execute(self, *args):
+        if time.monotonic() < self._down_until:
+            raise CacheUnavailable("shared cache marked down")
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await asyncio.wait_for(self._connect(), self.timeout)
+                return await asyncio.wait_for(self._roundtrip(*args), self.timeout)
+            except (OSError, ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                self._close()
+                self._down_until = time.monotonic() + self.RETRY_AFTER_SEC
+                raise CacheUnavailable(str(exc)) from exc
+
+    async def close(self):
+        async with self._lock:
+            self._close()
+
+
+class ResponseCache:
+    def __init__(self, local_size: int, local_ttl: float | None, default_ttl: int, shared: RespClient | None = None):
+        self.local_size = local_size
+        self.local_ttl = local_ttl
+        self.default_ttl = default_ttl
+        self.shared = shared
+        self._local: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self.hits = self.misses = 0
+
+    def _local_get(self, key: str):
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _local_set(self, key: str, value, ttl: float | None):
+        # 로컬 사본은 다른 워커의 무효화를 못 보므로 만료 없는 값도 만료시킨다 (완료된 Job 도 후처리로
+        # params 가 바뀔 수 있다). 공유 계층이 있으면 local_ttl, 없으면 default_ttl 을 넘지 않게 한다.
+        cap = self.local_ttl if self.local_ttl is not None else self.default_ttl
+        ttl = cap if ttl is None else min(ttl, cap)
+        self._local[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def get(self, key: str):
+        value = self._local_get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        if self.shared:
+            try:
+                raw = await self.shared.execute("GET", key)
+            except CacheUnavailable:
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                # 남은 TTL 을 모르므로 로컬에는 local_ttl 만큼만 둔다.
+                self._local_set(key, value, None)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value, ttl: int | None = -1):
+        """ttl=-1 이면 기본 TTL, None 이면 공유 계층에서 만료 없음 (로컬 사본은 _local_set 참고)."""
+        if ttl == -1:
+            ttl = self.default_ttl
+        self._local_set(key, value, ttl)
+        if self.shared:
+            payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+            args = ("SET", key, payload) if ttl is None else ("SET", key, payload, "EX", str(ttl))
+            try:
+                await self.shared.execute(*args)
+            except CacheUnavailable:
+                pass
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._local.pop(key, None)
+        if self.shared and keys:
+            try:
+                await self.shared.execute("DEL", *keys)
+            except CacheUnavailable:
+                pass
+
+    def clear_local(self):
+        self._local.clear()
+
+
+def render_job_key(job_id: int) -> str:
+    return f"render_job:{job_id}"
+
+
+def include_variants(prefix: str, includes: set[str]) -> list[str]:
+    """include 조합별로 나뉜 키를 모두 나열 (무효화용)."""
+    names = sorted(includes)
+    return [
+        f"{prefix}:{','.join(combo)}"
+        for n in range(len(names) + 1)
+        for combo in itertools.combinations(names, n)
+    ]
+
+
+def include_key(prefix: str, expand: set[str]) -> str:
+    return f"{prefix}:{','.join(sorted(expand))}"
+
+
+response_cache = ResponseCache(
+    local_size=settings.CACHE_LOCAL_SIZE,
+    local_ttl=settings.CACHE_LOCAL_TTL_SEC if settings.CACHE_URL else None,
+    default_ttl=settings.CACHE_TTL_SEC,
+    shared=RespClient(settings.CACHE_URL) if settings.CACHE_URL else None,
+)
@@ -0,0 +1,39 @@
+"""카탈로그 변경 감지 (catalog_versions).
+
+epochs/cosmic_events/annotations/elements 를 쓰는 쪽(import CLI, seed)은 같은 트랜잭션에서
+`bump_catalog_versions` 로 해당 테이블의 버전을 올린다. API 워커는 `catalog_versions.get` 으로
+`CATALOG_POLL_SEC` 마다 한 번만 버전을 읽어, 프로세스 내 캐시(검색 색인, facets)가 오래됐는지 판단한다.
+"""
+import time
+
+from sqlalchemy import insert, select, update
+
+from app.core.config import settings
+from app.db.models import CatalogVersion
+
+
+async def bump_catalog_versions(conn, *names: str):
+    """AsyncSession / AsyncConnection 모두 가능. 커밋은 호출한 쪽에서 한다."""
+    for name in names:
+        result = await conn.execute(
+            update(CatalogVersion).where(CatalogVersion.name == name).values(version=CatalogVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            await conn.execute(insert(CatalogVersion).values(name=name, version=1))
+
+
+class CatalogVersions:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._versions: dict[str, int] = {}
+        self._checked_at = float("-inf")
+
+    async def get(self, session, names: tuple[str, ...]) -> tuple[int, ...]:
+        if time.monotonic() - self._checked_at >= self.ttl:
+            rows = await session.execute(select(CatalogVersion.name, CatalogVersion.version))
+            self._versions = dict(rows.all())
+            self._checked_at = time.monotonic()
+        return tuple(self._versions.get(name, 0) for name in names)
+
+
+catalog_versions = CatalogVersions(settings.CATALOG_POLL_SEC)
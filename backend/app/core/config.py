@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,6 +8,25 @@ class Settings(BaseSettings):
     DB_DSN: str | None = None
     DATA_DIR: str = "data"
     BLENDER_BIN: str = "blender"  # 시스템에 설치된 블렌더 실행 파일 경로
+    SCENE_BAKE_ENABLED: bool = True  # 씬별로 모디파이어를 미리 적용한 .blend 를 만들어 익스포트에 사용
+    BLENDER_FAILURE_TTL_SEC: int = 3600  # 블렌더 작업(프리뷰/베이크) 실패 마커 유효 시간. 지나면 다시 시도
+    DB_POOL_SIZE: int = 5
+    DB_WARMUP_CONNECTIONS: int = 5  # 기동 시 미리 열어 둘 커넥션 수 (DB_POOL_SIZE 이하)
+    CACHE_URL: str | None = None  # redis://host:6379/0 — 설정 시 워커 간 공유 캐시 사용
+    CACHE_TTL_SEC: int = 60
+    CACHE_LOCAL_SIZE: int = 2048
+    CACHE_LOCAL_TTL_SEC: int = 5  # 공유 캐시 사용 시 프로세스 내 사본 보관 시간
+    CATALOG_POLL_SEC: int = 5  # 다른 프로세스의 카탈로그 변경(catalog_versions)을 확인하는 주기
+    RENDER_RETENTION_DAYS: int = 30  # 이 기간보다 오래된 done/failed 렌더 Job 은 아카이브 후 삭제
+    RENDER_RETENTION_BATCH: int = 1000
+    TEXTURE_MAX_SIZE: int = 2048  # GLB 임베디드 텍스처 최대 변 길이(px). 0 이면 텍스처 단계 생략
+    TEXTURE_FORMAT: Literal["webp", "jpeg"] = "webp"  # 알파 없는 텍스처 재인코딩 포맷 (webp|jpeg)
+    TEXTURE_QUALITY: int = 85
+    PROFILING_ENABLED: bool = False  # 요청 프로파일링 미들웨어 사용 여부
+    PROFILING_SECRET: str | None = None  # X-Profile-Token 서명 키 (/admin/profiles 접근에도 사용)
+    PROFILING_SAMPLE_RATE: float = 0.0  # 토큰 없이 무작위로 프로파일링할 요청 비율 (0~1)
+    PROFILING_INTERVAL_MS: float = 2.0
+    PROFILING_KEEP: int = 200  # 보관할 최근 프로파일 수
 
     model_config = SettingsConfigDict(env_file=".env")
 
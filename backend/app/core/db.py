@@ -1,9 +1,21 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
 
-engine = create_async_engine(settings.DB_DSN, echo=False, pool_pre_ping=True)
+
+def _engine_options(dsn: str) -> dict:
+    options = {"echo": False, "pool_pre_ping": True}
+    url = make_url(dsn)
+    # pool_size 는 QueuePool 계열에만 넘길 수 있다 (sqlite :memory: 는 StaticPool 이라 TypeError)
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        options["pool_size"] = settings.DB_POOL_SIZE
+    return options
+
+
+engine = create_async_engine(settings.DB_DSN, **_engine_options(settings.DB_DSN))
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
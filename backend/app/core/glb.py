@@ -0,0 +1,251 @@
+"""GLB(binary glTF 2.0) 컨테이너 파싱 유틸.
+
+메타데이터 조회는 바이너리 청크를 읽지 않고 12바이트 헤더와 JSON 청크만 mmap 으로 들여다본다.
+텍스처 재인코딩처럼 내용을 고쳐 써야 할 때만 `read_glb`/`write_glb` 로 전체를 읽고 쓴다.
+"""
+import json
+import mmap
+import struct
+from pathlib import Path
+from uuid import uuid4
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+_HEADER = struct.Struct("<4sII")
+_CHUNK_HEADER = struct.Struct("<II")
+
+# primitive.mode → 삼각형 수 계산 (4: TRIANGLES, 5: TRIANGLE_STRIP, 6: TRIANGLE_FAN)
+_TRIANGLE_MODES = {4, 5, 6}
+
+
+class GLBError(ValueError):
+    pass
+
+
+def parse_glb_header(buf) -> tuple[int, int]:
+    """(version, total_length) 를 반환. buf 는 bytes/memoryview 모두 가능."""
+    if len(buf) < _HEADER.size:
+        raise GLBError("GLB 헤더가 너무 짧습니다.")
+    magic, version, length = _HEADER.unpack_from(buf, 0)
+    if magic != GLB_MAGIC:
+        raise GLBError("GLB 매직 넘버가 아닙니다.")
+    if version != 2:
+        raise GLBError(f"지원하지 않는 glTF 버전: {version}")
+    return version, length
+
+
+def _unpack_chunk_header(buf, offset: int, what: str) -> tuple[int, int]:
+    if offset + _CHUNK_HEADER.size > len(buf):
+        raise GLBError(f"{what} 청크 헤더가 잘렸습니다.")
+    return _CHUNK_HEADER.unpack_from(buf, offset)
+
+
+def _parse_json_chunk(raw: bytes) -> dict:
+    try:
+        gltf = json.loads(raw)
+    except ValueError as exc:
+        raise GLBError(f"JSON 청크를 해석할 수 없습니다: {exc}") from exc
+    if not isinstance(gltf, dict):
+        raise GLBError("JSON 청크가 객체가 아닙니다.")
+    return gltf
+
+
+def read_glb_json(path: Path) -> tuple[dict, int]:
+    """GLB 의 JSON 청크만 파싱해 (gltf_json, 바이너리 청크 길이) 를 반환."""
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            parse_glb_header(view)
+            json_len, json_type = _unpack_chunk_header(view, _HEADER.size, "JSON")
+            if json_type != CHUNK_JSON:
+                raise GLBError("첫 번째 청크가 JSON 이 아닙니다.")
+            start = _HEADER.size + _CHUNK_HEADER.size
+            if start + json_len > len(view):
+                raise GLBError("JSON 청크가 파일 끝을 넘어갑니다.")
+            # 예외 traceback 이 memoryview 조각을 잡고 있으면 mmap 을 닫을 수 없으므로 bytes 로 복사해서 넘긴다
+            gltf = _parse_json_chunk(bytes(view[start:start + json_len]))
+
+            bin_len = 0
+            bin_header = start + json_len
+            if bin_header + _CHUNK_HEADER.size <= len(view):
+                length, chunk_type = _CHUNK_HEADER.unpack_from(view, bin_header)
+                if chunk_type == CHUNK_BIN:
+                    bin_len = length
+        finally:
+            view.release()
+    return gltf, bin_len
+
+
+def read_glb(path: Path) -> tuple[dict, bytes]:
+    """GLB 전체를 읽어 (gltf_json, 바이너리 청크) 를 반환. 바이너리 청크가 없으면 b""."""
+    data = path.read_bytes()
+    _, length = parse_glb_header(data)
+    json_len, json_type = _unpack_chunk_header(data, _HEADER.size, "JSON")
+    if json_type != CHUNK_JSON:
+        raise GLBError("첫 번째 청크가 JSON 이 아닙니다.")
+    start = _HEADER.size + _CHUNK_HEADER.size
+    if start + json_len > len(data):
+        raise GLBError("JSON 청크가 파일 끝을 넘어갑니다.")
+    gltf = _parse_json_chunk(data[start:start + json_len])
+
+    bin_chunk = b""
+    bin_header = start + json_len
+    if bin_header + _CHUNK_HEADER.size <= min(length, len(data)):
+        bin_len, chunk_type = _CHUNK_HEADER.unpack_from(data, bin_header)
+        if chunk_type == CHUNK_BIN:
+            bin_start = bin_header + _CHUNK_HEADER.size
+            if bin_start + bin_len > len(data):
+                raise GLBError("BIN 청크가 파일 끝을 넘어갑니다.")
+            bin_chunk = data[bin_start:bin_start + bin_len]
+    return gltf, bin_chunk
+
+
+def _pad4(data: bytes, fill: bytes) -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+def write_glb(path: Path, gltf: dict, bin_chunk: bytes):
+    """JSON/BIN 청크를 4바이트 정렬해 GLB 로 쓴다. 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 임시 파일 후 교체."""
+    json_chunk = _pad4(json.dumps(gltf, ensure_ascii=False, separators=(",", ":")).encode(), b" ")
+    parts = [_CHUNK_HEADER.pack(len(json_chunk), CHUNK_JSON), json_chunk]
+    if bin_chunk:
+        bin_chunk = _pad4(bin_chunk, b"\0")
+        parts += [_CHUNK_HEADER.pack(len(bin_chunk), CHUNK_BIN), bin_chunk]
+    total = _HEADER.size + sum(len(p) for p in parts)
+    tmp = path.with_name(f".{uuid4().hex}{path.suffix}")
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(GLB_MAGIC, 2, total))
+        for part in parts:
+            fh.write(part)
+    tmp.replace(path)
+
+
+# --- 씬 그래프 통계 ---
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+def _matmul(a, b):
+    # glTF 는 column-major 4x4
+    return tuple(
+        sum(a[k * 4 + row] * b[col * 4 + k] for k in range(4))
+        for col in range(4)
+        for row in range(4)
+    )
+
+
+def _local_matrix(node: dict):
+    if "matrix" in node:
+        return tuple(float(v) for v in node["matrix"])
+    tx, ty, tz = node.get("translation", (0.0, 0.0, 0.0))
+    qx, qy, qz, qw = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    sx, sy, sz = node.get("scale", (1.0, 1.0, 1.0))
+    return (
+        (1 - 2 * (qy * qy + qz * qz)) * sx, (2 * (qx * qy + qz * qw)) * sx, (2 * (qx * qz - qy * qw)) * sx, 0.0,
+        (2 * (qx * qy - qz * qw)) * sy, (1 - 2 * (qx * qx + qz * qz)) * sy, (2 * (qy * qz + qx * qw)) * sy, 0.0,
+        (2 * (qx * qz + qy * qw)) * sz, (2 * (qy * qz - qx * qw)) * sz, (1 - 2 * (qx * qx + qy * qy)) * sz, 0.0,
+        tx, ty, tz, 1.0,
+    )
+
+
+def _transform_point(m, p):
+    x, y, z = p
+    return (
+        m[0] * x + m[4] * y + m[8] * z + m[12],
+        m[1] * x + m[5] * y + m[9] * z + m[13],
+        m[2] * x + m[6] * y + m[10] * z + m[14],
+    )
+
+
+def _primitive_triangles(gltf: dict, prim: dict) -> int:
+    mode = prim.get("mode", 4)
+    if mode not in _TRIANGLE_MODES:
+        return 0
+    accessors = gltf.get("accessors", [])
+    if "indices" in prim:
+        count = accessors[prim["indices"]]["count"]
+    elif "POSITION" in prim.get("attributes", {}):
+        count = accessors[prim["attributes"]["POSITION"]]["count"]
+    else:
+        return 0
+    return count // 3 if mode == 4 else max(count - 2, 0)
+
+
+def summarize_gltf(gltf: dict) -> dict:
+    """노드/메시/삼각형 수와 월드 좌표 AABB 를 계산 (메시 인스턴스 기준)."""
+    nodes = gltf.get("nodes", [])
+    meshes = gltf.get("meshes", [])
+    accessors = gltf.get("accessors", [])
+
+    mesh_triangles = [sum(_primitive_triangles(gltf, p) for p in m.get("primitives", [])) for m in meshes]
+    mesh_bounds = []
+    for mesh in meshes:
+        lo, hi = [float("inf")] * 3, [float("-inf")] * 3
+        for prim in mesh.get("primitives", []):
+            pos = prim.get("attributes", {}).get("POSITION")
+            acc = accessors[pos] if pos is not None else None
+            if not acc or "min" not in acc or "max" not in acc:
+                continue
+            lo = [min(a, b) for a, b in zip(lo, acc["min"])]
+            hi = [max(a, b) for a, b in zip(hi, acc["max"])]
+        mesh_bounds.append((lo, hi) if lo[0] != float("inf") else None)
+
+    scenes = gltf.get("scenes", [])
+    scene_idx = gltf.get("scene", 0)
+    if scenes and scene_idx < len(scenes):
+        roots = scenes[scene_idx].get("nodes", [])
+    else:
+        children = {c for n in nodes for c in n.get("children", [])}
+        roots = [i for i in range(len(nodes)) if i not in children]
+
+    bb_lo, bb_hi = [float("inf")] * 3, [float("-inf")] * 3
+    triangles = 0
+    mesh_instances = 0
+    stack = [(i, _IDENTITY) for i in roots]
+    visited = set()
+    while stack:
+        idx, parent = stack.pop()
+        if idx in visited or idx >= len(nodes):
+            continue
+        visited.add(idx)
+        node = nodes[idx]
+        world = _matmul(parent, _local_matrix(node))
+        mesh_idx = node.get("mesh")
+        if mesh_idx is not None and mesh_idx < len(meshes):
+            mesh_instances += 1
+            triangles += mesh_triangles[mesh_idx]
+            bounds = mesh_bounds[mesh_idx]
+            if bounds:
+                lo, hi = bounds
+                for corner in ((x, y, z) for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])):
+                    p = _transform_point(world, corner)
+                    bb_lo = [min(a, b) for a, b in zip(bb_lo, p)]
+                    bb_hi = [max(a, b) for a, b in zip(bb_hi, p)]
+        stack.extend((c, world) for c in node.get("children", []))
+
+    has_bounds = bb_lo[0] != float("inf")
+    return {
+        "node_count": len(nodes),
+        "mesh_count": len(meshes),
+        "mesh_instances": mesh_instances,
+        "triangle_count": triangles,
+        "material_count": len(gltf.get("materials", [])),
+        "image_count": len(gltf.get("images", [])),
+        "bbox_min": bb_lo if has_bounds else None,
+        "bbox_max": bb_hi if has_bounds else None,
+    }
+
+
+def inspect_glb(path: Path) -> dict:
+    """GLB 파일 메타데이터 (바이너리 청크는 읽지 않음)."""
+    gltf, bin_len = read_glb_json(path)
+    try:
+        stats = summarize_gltf(gltf)
+    except (LookupError, TypeError, ValueError) as exc:
+        # 범위를 벗어난 accessor/mesh 인덱스, 빠진 필드, 잘못된 타입 등
+        raise GLBError(f"glTF 구조가 올바르지 않습니다: {type(exc).__name__}: {exc}") from exc
+    stats["byte_size"] = path.stat().st_size
+    stats["bin_chunk_size"] = bin_len
+    return stats
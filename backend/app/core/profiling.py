@@ -0,0 +1,253 @@
+"""요청 단위 on-demand 프로파일링.
+
+`PROFILING_ENABLED=true` 일 때, 서명된 `X-Profile-Token` 헤더가 있거나 `PROFILING_SAMPLE_RATE`
+확률에 걸린 요청만 샘플링한다. 별도 스레드가 주기적으로 요청 태스크의 코루틴 체인(cr_await)을
+따라가므로, CPU 를 쓰는 구간뿐 아니라 DB 응답이나 블렌더 subprocess(to_thread)를 기다리는 구간도
+`<await ...>` 프레임으로 잡힌다. cProfile 은 await 중인 시간을 볼 수 없어 쓰지 않는다.
+
+결과는 `DATA_DIR/profiles/` 에 flamegraph.pl / speedscope 가 읽는 folded stack 형식(`.folded`)과
+메타데이터(`.json`)로 저장한다.
+
+토큰 발급: `python -m app.core.profiling --ttl 600`
+"""
+import argparse
+import asyncio
+import gc
+import hashlib
+import hmac
+import json
+import random
+import re
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.storage import ensure_subdir
+
+TOKEN_HEADER = b"x-profile-token"
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+
+def make_profile_token(ttl_sec: int = 600) -> str:
+    if not settings.PROFILING_SECRET:
+        raise RuntimeError("PROFILING_SECRET 이 설정되지 않았습니다.")
+    expires = int(time.time()) + ttl_sec
+    sig = hmac.new(settings.PROFILING_SECRET.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{sig}"
+
+
+def verify_profile_token(token: str | None) -> bool:
+    if not token or not settings.PROFILING_SECRET:
+        return False
+    expires, _, sig = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = hmac.new(settings.PROFILING_SECRET.encode(), expires.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(sig, expected)
+
+
+def profiles_dir() -> Path:
+    return ensure_subdir("profiles")
+
+
+# --- 샘플러 ---
+
+_PATH_PREFIXES = sorted(
+    {
+        (sysconfig.get_paths()[key].rstrip("/") + "/", label)
+        for key, label in (("stdlib", "stdlib/"), ("purelib", ""), ("platlib", ""))
+    }
+    | {(str(Path(__file__).resolve().parents[2]) + "/", "")},
+    key=lambda item: len(item[0]),
+    reverse=True,
+)
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    for prefix, label in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return label + filename[len(prefix):]
+    return filename
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _awaited_generator(obj):
+    # `async for` / 의존성 정리(get_session 등)는 async_generator_asend 를 await 한다.
+    # 이 객체는 원래 제너레이터를 속성으로 노출하지 않으므로 GC 참조로 찾는다.
+    if type(obj).__name__ in ("async_generator_asend", "async_generator_athrow"):
+        for ref in gc.get_referents(obj):
+            if hasattr(ref, "ag_frame"):
+                return ref
+    return None
+
+
+def _coroutine_frames(coro):
+    """코루틴 체인을 바깥→안쪽 순서의 프레임 목록과, 마지막으로 기다리는 객체로 반환."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        nxt = getattr(coro, "cr_await", None)
+        if nxt is None:
+            nxt = getattr(coro, "gi_yieldfrom", None)
+        if nxt is None:
+            nxt = getattr(coro, "ag_await", None)
+        if nxt is not None and not any(hasattr(nxt, attr) for attr in ("cr_frame", "gi_frame", "ag_frame")):
+            nxt = _awaited_generator(nxt) or nxt
+        if nxt is None or not any(hasattr(nxt, attr) for attr in ("cr_frame", "gi_frame", "ag_frame")):
+            return frames, nxt
+        coro = nxt
+    return frames, None
+
+
+def _awaited_label(awaited) -> str:
+    if awaited is None:
+        return "<await idle>"
+    name = type(awaited).__name__
+    # asyncio.Future 의 __await__ 는 FutureIter 를 돌려준다
+    return "<await Future>" if name == "FutureIter" else f"<await {name}>"
+
+
+class _TaskSampler(threading.Thread):
+    def __init__(self, task: asyncio.Task, loop_thread_id: int, interval: float):
+        super().__init__(daemon=True, name="request-profiler")
+        self.task = task
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def _sample(self) -> list[str] | None:
+        frames, awaited = _coroutine_frames(self.task.get_coro())
+        if not frames:
+            return None
+        thread_frame = sys._current_frames().get(self.loop_thread_id)
+        thread_stack = []
+        while thread_frame is not None:
+            thread_stack.append(thread_frame)
+            thread_frame = thread_frame.f_back
+        thread_stack.reverse()
+        # 이 태스크가 지금 이벤트 루프에서 실행 중이면 실제 스레드 스택(동기 호출 포함)을 쓴다.
+        if frames[-1] in thread_stack:
+            start = thread_stack.index(frames[0]) if frames[0] in thread_stack else 0
+            return [_frame_label(f) for f in thread_stack[start:]]
+        labels = [_frame_label(f) for f in frames]
+        labels.append(_awaited_label(awaited))
+        return labels
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            if self.task.done():
+                break
+            try:
+                stack = self._sample()
+            except Exception:
+                # 다른 스레드가 바꾸는 중인 코루틴을 읽을 수 있으므로 깨진 샘플은 버린다.
+                continue
+            if stack:
+                self.counts[";".join(stack)] += 1
+
+
+def _save_profile(counts: Counter, meta: dict) -> str:
+    target = profiles_dir()
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    slug = _SLUG_RE.sub("_", meta["path"]).strip("_")[:60] or "root"
+    name = f"{stamp}-{meta['method']}-{slug}"
+    (target / f"{name}.folded").write_text("".join(f"{stack} {n}\n" for stack, n in counts.most_common()))
+    (target / f"{name}.json").write_text(json.dumps({**meta, "name": name}, ensure_ascii=False))
+
+    # 오래된 프로파일 정리
+    metas = sorted(target.glob("*.json"))
+    for old in metas[:-settings.PROFILING_KEEP] if len(metas) > settings.PROFILING_KEEP else []:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".folded").unlink(missing_ok=True)
+    return name
+
+
+def list_profiles(limit: int = 50) -> list[dict]:
+    metas = sorted(profiles_dir().glob("*.json"), reverse=True)[:limit]
+    out = []
+    for path in metas:
+        try:
+            out.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+class ProfilingMiddleware:
+    """순수 ASGI 미들웨어 — 엔드포인트가 같은 태스크에서 실행되어야 코루틴 체인을 따라갈 수 있다."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _should_profile(self, scope) -> tuple[bool, str]:
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            return False, ""
+        token = dict(scope.get("headers") or []).get(TOKEN_HEADER)
+        if token is not None and verify_profile_token(token.decode("latin-1")):
+            return True, "token"
+        if settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return True, "sampled"
+        return False, ""
+
+    async def __call__(self, scope, receive, send):
+        profile, trigger = self._should_profile(scope)
+        if not profile:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        sampler = _TaskSampler(asyncio.current_task(), threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status["code"],
+                "trigger": trigger,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "samples": sum(sampler.counts.values()),
+                "interval_ms": settings.PROFILING_INTERVAL_MS,
+                "created_at": datetime.utcnow().isoformat(),
+            }
+            try:
+                await asyncio.to_thread(_save_profile, sampler.counts, meta)
+            except OSError as exc:
+                print(f"Failed to save profile for {meta['method']} {meta['path']}: {exc}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="X-Profile-Token 헤더용 서명 토큰 발급")
+    parser.add_argument("--ttl", type=int, default=600, help="유효 시간(초)")
+    args = parser.parse_args()
+    print(make_profile_token(args.ttl))
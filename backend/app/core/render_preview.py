@@ -0,0 +1,81 @@
+import bpy
+import sys
+import os
+from mathutils import Vector
+
+
+def _frame_scene(scene):
+    """Ensures there is a camera that frames every mesh in the scene."""
+    corners = [
+        obj.matrix_world @ Vector(corner)
+        for obj in scene.objects
+        if obj.type == 'MESH'
+        for corner in obj.bound_box
+    ]
+    if scene.camera and not corners:
+        return
+    if not corners:
+        corners = [Vector((-1, -1, -1)), Vector((1, 1, 1))]
+
+    lo = Vector((min(c.x for c in corners), min(c.y for c in corners), min(c.z for c in corners)))
+    hi = Vector((max(c.x for c in corners), max(c.y for c in corners), max(c.z for c in corners)))
+    center = (lo + hi) / 2
+    radius = max((hi - lo).length / 2, 0.01)
+
+    cam_data = bpy.data.cameras.new("PreviewCamera")
+    cam = bpy.data.objects.new("PreviewCamera", cam_data)
+    scene.collection.objects.link(cam)
+    direction = Vector((1.0, -1.0, 0.7)).normalized()
+    cam.location = center + direction * radius * 2.8
+    cam.rotation_euler = (center - cam.location).to_track_quat('-Z', 'Y').to_euler()
+    cam_data.clip_end = max(cam_data.clip_end, radius * 10)
+    scene.camera = cam
+
+
+def render_preview(output_path, size):
+    """Renders a cheap, low-sample still of the current scene to a PNG file."""
+    try:
+        output_dir = os.path.dirname(output_path)
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        scene = bpy.context.scene
+        # Workbench is the viewport renderer: no light transport, a single sample.
+        scene.render.engine = 'BLENDER_WORKBENCH'
+        scene.display.render_aa = 'OFF'
+        scene.render.resolution_x = size
+        scene.render.resolution_y = size
+        scene.render.resolution_percentage = 100
+        scene.render.film_transparent = True
+        scene.render.image_settings.file_format = 'PNG'
+        scene.render.image_settings.color_mode = 'RGBA'
+        scene.render.filepath = output_path
+
+        _frame_scene(scene)
+        bpy.ops.render.render(write_still=True)
+        print(f"Successfully rendered preview to {output_path}")
+        return True
+    except Exception as e:
+        print(f"Error rendering preview: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc(file=sys.stderr)
+        return False
+
+if __name__ == "__main__":
+    # Example: blender my_scene.blend --python render_preview.py -- /path/to/preview.png 256
+    argv = sys.argv
+    try:
+        if "--" in argv:
+            args = argv[argv.index("--") + 1:]
+            if not args:
+                raise ValueError("No output path provided.")
+            output_filepath = args[0]
+            preview_size = int(args[1]) if len(args) > 1 else 256
+            if not render_preview(output_filepath, preview_size):
+                sys.exit(1)
+        else:
+            raise ValueError("Separator '--' not found in arguments.")
+    except ValueError as err:
+        print(f"Argument error: {err}", file=sys.stderr)
+        print("Usage: blender <blend_file> --python render_preview.py -- <output_path.png> [size]", file=sys.stderr)
+        sys.exit(1)
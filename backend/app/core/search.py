@@ -0,0 +1,569 @@
+"""이벤트/주석/엘리먼트 텍스트에 대한 프로세스 내 역색인(BM25).
+
+한국어는 형태소 분석 없이 문자 bigram(+문서 쪽 unigram)으로 토큰화하고, 영문/숫자는 단어 단위로 색인한다.
+posting 은 배열로 두고, 검색은 BM25 상위 k 개를 정확히 구하되 k 번째 점수를 넘을 수 없는 문서는 채점하지 않는다.
+전체 재구축은 필요한 컬럼만 읽어 스레드에서 새 색인을 만든 뒤 교체하므로 이벤트 루프를 막지 않는다.
+같은 프로세스의 ORM 변경은 커밋 시점에 증분 반영하고, 다른 프로세스(import CLI, seed)의 변경은
+catalog_versions 로 감지해 백그라운드에서 재구축한다.
+"""
+import argparse
+import asyncio
+import gc
+import heapq
+import math
+import re
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from operator import neg
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.catalog import catalog_versions
+from app.core.db import SessionLocal
+from app.db.models import Annotation, CosmicEvent, Element
+
+_WORD_RE = re.compile(r"\w+")
+_SCRIPT_RE = re.compile(r"[a-z0-9]+|[^a-z0-9]+")
+_ONE_RE = re.compile("1")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 색인 대상 테이블 (catalog_versions 이름)
+SEARCH_TABLES = ("cosmic_events", "annotations", "elements")
+
+SEARCH_EXHAUSTIVE_POSTINGS = 12000  # 질의 토큰들의 posting 합이 이 이하면 패턴 없이 전부 누적
+SEARCH_PATTERN_TERMS = 6  # 패턴(부분집합)으로 나눌 최대 토큰 수. 나머지는 채점 때만 더한다
+SEARCH_PATTERN_WALK = 512  # 한 패턴의 문서가 이보다 많으면 전부 채점하지 않고 impact 순서로 훑다 멈춘다
+SEARCH_DENSE_FRACTION = 16  # 문서 수의 1/16 이상에 나오는 토큰은 비트맵/문서별 tf 표를 둔다
+SEARCH_PRERANK_MIN_DF = 256  # 이보다 posting 이 긴 토큰은 재구축 때 impact 정렬을 미리 만든다
+
+
+def tokenize(text: str | None, query: bool = False) -> list[str]:
+    """영문/숫자 덩어리는 단어 그대로, 그 외(한글 등)는 문자 bigram 으로 쪼갠다.
+
+    문서 쪽은 bigram 과 함께 한 글자(unigram)도 색인해 "별", "빛" 같은 한 음절 검색이 맞도록 한다.
+    질의 쪽은 한 글자 덩어리만 unigram 으로 두고, 두 글자 이상은 bigram 으로만 찾는다.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens: list[str] = []
+    for word in _WORD_RE.findall(text):
+        for run in _SCRIPT_RE.findall(word.replace("_", "")):
+            if run[0].isascii() or len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+                if not query:
+                    tokens.extend(run)
+    return tokens
+
+
+@dataclass(slots=True)
+class SearchDoc:
+    kind: str  # event / annotation / element
+    id: int
+    title: str
+    time_norm: float | None
+
+
+DocKey = tuple[str, int]
+
+
+def _event_doc(id, title, description, time_norm) -> tuple[SearchDoc, str]:
+    return SearchDoc("event", id, title, time_norm), f"{title} {description or ''}"
+
+
+def _annotation_doc(id, title, content, time_mark) -> tuple[SearchDoc, str]:
+    return SearchDoc("annotation", id, title, time_mark), f"{title} {content}"
+
+
+def _element_doc(id, name, type, description) -> tuple[SearchDoc, str]:
+    return SearchDoc("element", id, name, None), f"{name} {type} {description or ''}"
+
+
+# (모델, 색인에 필요한 컬럼, 문서 생성 함수) — 재구축은 ORM 객체 대신 이 컬럼만 읽는다.
+_SOURCES = (
+    (CosmicEvent, (CosmicEvent.id, CosmicEvent.title, CosmicEvent.description, CosmicEvent.time_norm), _event_doc),
+    (Annotation, (Annotation.id, Annotation.title, Annotation.content, Annotation.time_mark), _annotation_doc),
+    (Element, (Element.id, Element.name, Element.type, Element.description), _element_doc),
+)
+
+
+def _doc_for(obj) -> tuple[SearchDoc, str] | None:
+    for model, columns, make in _SOURCES:
+        if isinstance(obj, model):
+            return make(*(getattr(obj, column.key) for column in columns))
+    return None
+
+
+class _Postings:
+    """토큰 하나의 posting.
+
+    - docs/tfs: 문서 번호 오름차순 (이분 탐색용)
+    - ranked: impact 내림차순 (order, impacts). 처음 필요할 때(또는 freeze 때) 만들고, 이후 추가되는 문서는
+      impact 순서 자리에 끼워 넣어 유지한다. 삭제는 tombstone 이라 건드리지 않는다.
+    - bits/tf_at: 흔한 토큰(dense)만 — 문서 번호 비트맵과 문서 번호 → tf 표(255 이상은 tfs 에서 찾는다)
+    """
+
+    __slots__ = ("docs", "tfs", "ranked", "bits", "tf_at")
+
+    def __init__(self):
+        self.docs = array("i")
+        self.tfs = array("H")
+        self.ranked: tuple[array, array] | None = None
+        self.bits: int | None = None
+        self.tf_at: bytearray | None = None
+
+
+def _positions(bits: int) -> list[int]:
+    """비트맵에서 켜진 비트 위치(문서 번호) 목록."""
+    return [m.start() for m in _ONE_RE.finditer(bin(bits)[:1:-1])]
+
+
+def _patterns(maxima: list[float]):
+    """토큰 부분집합을 최대 점수 합이 큰 순서로 (bitmask, 합) 으로 낸다 (공집합 제외).
+
+    maxima 는 오름차순이어야 한다. 빼는 토큰 집합을 합이 작은 순서로 만드는 표준 방식으로, 각 집합을 한 번씩만 낸다.
+    """
+    n = len(maxima)
+    full = (1 << n) - 1
+    total = sum(maxima)
+    heap = [(0.0, 0, -1)]  # (뺀 토큰들의 합, 뺀 토큰 bitmask, 마지막으로 뺀 토큰)
+    while heap:
+        removed, mask, last = heapq.heappop(heap)
+        if mask != full:
+            yield full & ~mask, total - removed
+        nxt = last + 1
+        if nxt < n:
+            heapq.heappush(heap, (removed + maxima[nxt], mask | 1 << nxt, nxt))
+            if last >= 0:
+                heapq.heappush(heap, (removed - maxima[last] + maxima[nxt], (mask & ~(1 << last)) | 1 << nxt, nxt))
+
+
+class InvertedIndex:
+    """배열 기반 역색인 + 정확한 BM25 top-k 검색.
+
+    문서는 추가 순서대로 번호(ordinal)를 받고, 삭제는 번호를 비워 두는 방식(tombstone)이라
+    posting 배열을 고쳐 쓰지 않는다. 비워진 번호는 다음 전체 재구축 때 정리된다.
+    BM25 의 평균 문서 길이는 `freeze()` 시점 값으로 고정해 impact 정렬과 점수 계산이 어긋나지 않게 한다.
+
+    여러 토큰 질의는 "어떤 토큰들을 가졌는가"(패턴)로 문서를 나눠, 패턴의 최대 점수 합이 큰 순서로
+    비트맵 AND 로 해당 문서만 뽑아 채점한다. 다음 패턴의 최대 점수 합이 k 번째 점수 이하가 되면
+    남은 문서는 상위 k 에 들 수 없으므로 멈춘다. 흔한 토큰은 비트맵과 문서별 tf 표를 미리 두어
+    교집합과 채점을 posting 을 훑지 않고 처리한다.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, _Postings] = {}
+        self._docs: list[SearchDoc | None] = []
+        self._doc_len = array("i")
+        self._ordinal: dict[DocKey, int] = {}
+        self._kind_bits: dict[str, int] = {}  # 종류별 살아 있는 문서 비트맵
+        self._live = 0
+        self._total_len = 0
+        self._avgdl = 1.0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def _impact(self, tf: int, length: int) -> float:
+        return tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B) + BM25_K1 * BM25_B / self._avgdl * length)
+
+    def add(self, doc: SearchDoc, text: str):
+        key = (doc.kind, doc.id)
+        self.remove(key)
+        ordinal = len(self._docs)
+        tf = Counter(tokenize(text))
+        length = sum(tf.values())
+        postings = self._postings
+        for token, count in tf.items():
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = _Postings()
+            count = count if count < 0xFFFF else 0xFFFF
+            entry.docs.append(ordinal)
+            entry.tfs.append(count)
+            if entry.ranked is not None:
+                order, impacts = entry.ranked
+                impact = self._impact(count, length)
+                at = bisect_right(impacts, -impact, key=neg)
+                order.insert(at, ordinal)
+                impacts.insert(at, impact)
+            if entry.bits is not None:
+                entry.bits |= 1 << ordinal
+                entry.tf_at.extend(bytes(ordinal + 1 - len(entry.tf_at)))
+                entry.tf_at[ordinal] = count if count < 0xFF else 0xFF
+        self._docs.append(doc)
+        self._doc_len.append(length)
+        self._ordinal[key] = ordinal
+        self._kind_bits[doc.kind] = self._kind_bits.get(doc.kind, 0) | 1 << ordinal
+        self._live += 1
+        self._total_len += length
+
+    def remove(self, key: DocKey):
+        ordinal = self._ordinal.pop(key, None)
+        if ordinal is None:
+            return
+        self._kind_bits[key[0]] &= ~(1 << ordinal)
+        self._docs[ordinal] = None
+        self._live -= 1
+        self._total_len -= self._doc_len[ordinal]
+
+    def freeze(self):
+        """평균 문서 길이를 고정하고, posting 이 긴 토큰의 impact 정렬과 흔한 토큰의 비트맵/tf 표를 만든다."""
+        self._avgdl = self._total_len / self._live if self._live else 1.0
+        dense_df = max(SEARCH_PRERANK_MIN_DF, len(self._docs) // SEARCH_DENSE_FRACTION)
+        for entry in self._postings.values():
+            entry.ranked = entry.bits = entry.tf_at = None
+            if len(entry.docs) >= SEARCH_PRERANK_MIN_DF:
+                self._ranked(entry)
+            if len(entry.docs) >= dense_df:
+                tf_at = bytearray(entry.docs[-1] + 1)
+                for o, tf in zip(entry.docs, entry.tfs):
+                    tf_at[o] = tf if tf < 0xFF else 0xFF
+                entry.tf_at = tf_at
+                entry.bits = self._bitmap(entry.docs)
+
+    def _bitmap(self, docs: array) -> int:
+        bits = bytearray((len(self._docs) >> 3) + 1)
+        for o in docs:
+            bits[o >> 3] |= 1 << (o & 7)
+        return int.from_bytes(bits, "little")
+
+    def _ranked(self, entry: _Postings) -> tuple[array, array]:
+        if entry.ranked is None:
+            norm = BM25_K1 * (1 - BM25_B)
+            scale = BM25_K1 * BM25_B / self._avgdl
+            doc_len = self._doc_len
+            impacts = [tf * (BM25_K1 + 1) / (tf + norm + scale * doc_len[o]) for o, tf in zip(entry.docs, entry.tfs)]
+            order = sorted(range(len(impacts)), key=impacts.__getitem__, reverse=True)
+            entry.ranked = (array("i", [entry.docs[i] for i in order]), array("d", [impacts[i] for i in order]))
+        return entry.ranked
+
+    def _terms(self, query: str) -> list[tuple[float, _Postings]]:
+        """질의 토큰별 (idf, posting)."""
+        live = self._live
+        terms = []
+        for token in set(tokenize(query, query=True)):
+            entry = self._postings.get(token)
+            if entry is None:
+                continue
+            df = len(entry.docs)  # tombstone 포함 — 재구축 전까지는 근사치
+            terms.append((math.log(1 + (max(live - df, 0) + 0.5) / (df + 0.5)), entry))
+        return terms
+
+    def _valid_bits(self, kinds: set[str] | None) -> int:
+        bits = 0
+        for kind, kind_bits in self._kind_bits.items():
+            if not kinds or kind in kinds:
+                bits |= kind_bits
+        return bits
+
+    def search(self, query: str, limit: int = 20, kinds: set[str] | None = None) -> list[tuple[SearchDoc, float]]:
+        """BM25 점수 상위 limit 개 (정확한 top-k)."""
+        if not self._live or limit <= 0:
+            return []
+        terms = self._terms(query)
+        if not terms:
+            return []
+        docs = self._docs
+
+        if len(terms) == 1:
+            # impact 내림차순 목록을 앞에서부터 걸러 담으면 그대로 점수순이다.
+            idf, entry = terms[0]
+            hits = []
+            for o, impact in zip(*self._ranked(entry)):
+                doc = docs[o]
+                if doc is not None and (not kinds or doc.kind in kinds):
+                    hits.append((doc, idf * impact))
+                    if len(hits) >= limit:
+                        break
+            return hits
+
+        if sum(len(entry.docs) for _, entry in terms) <= SEARCH_EXHAUSTIVE_POSTINGS:
+            # posting 이 짧으면 전부 누적하는 편이 비트맵을 만드는 것보다 싸다.
+            scores: dict[int, float] = {}
+            get = scores.get
+            for idf, entry in terms:
+                for o, impact in zip(*self._ranked(entry)):
+                    scores[o] = get(o, 0.0) + idf * impact
+            hits = (
+                (score, o) for o, score in scores.items()
+                if docs[o] is not None and (not kinds or docs[o].kind in kinds)
+            )
+            return [(docs[o], score) for score, o in heapq.nlargest(limit, hits)]
+
+        heap = self._search_patterns(terms, limit, self._valid_bits(kinds))
+        heap.sort(reverse=True)
+        return [(docs[o], score) for score, o in heap]
+
+    def _search_patterns(self, terms, limit: int, valid: int) -> list[tuple[float, int]]:
+        # 최대 기여도가 큰 SEARCH_PATTERN_TERMS 개만 패턴으로 나누고, 나머지 토큰은 채점 때만 더한다
+        # (그 토큰들의 최대 기여도 합 extra 를 모든 패턴의 상한에 더한다).
+        terms = sorted(terms, key=lambda t: t[0] * self._ranked(t[1])[1][0])
+        split = max(0, len(terms) - SEARCH_PATTERN_TERMS)
+        rest, terms = terms[:split], terms[split:]
+        extra = sum(idf * self._ranked(entry)[1][0] for idf, entry in rest) + 1e-9  # 반올림 여유
+        bits = [entry.bits if entry.bits is not None else self._bitmap(entry.docs) for _, entry in terms]
+        maxima = [idf * self._ranked(entry)[1][0] for idf, entry in terms]
+
+        norm = BM25_K1 * (1 - BM25_B)
+        scale = BM25_K1 * BM25_B / self._avgdl
+        doc_len = self._doc_len
+        scorers = [(idf * (BM25_K1 + 1), entry.tf_at, entry.docs, entry.tfs) for idf, entry in terms + rest]
+        heap: list[tuple[float, int]] = []
+
+        def score_all(positions, scoring):
+            for o in positions:
+                length = norm + scale * doc_len[o]
+                score = 0.0
+                for weight, tf_at, term_docs, tfs in scoring:
+                    if tf_at is not None and o < len(tf_at):
+                        tf = tf_at[o]
+                        if tf == 0xFF:
+                            tf = tfs[bisect_left(term_docs, o)]
+                    else:
+                        j = bisect_left(term_docs, o)
+                        tf = tfs[j] if j < len(term_docs) and term_docs[j] == o else 0
+                    if tf:
+                        score += weight * tf / (tf + length)
+                if len(heap) < limit:
+                    heapq.heappush(heap, (score, o))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, o))
+
+        for mask, upper in _patterns(maxima):
+            if len(heap) >= limit and upper + extra <= heap[0][0]:
+                return heap
+            matched = valid
+            for i, term_bits in enumerate(bits):
+                if mask >> i & 1:
+                    matched &= term_bits
+                    if not matched:
+                        break
+            if not matched:
+                continue
+            for i, term_bits in enumerate(bits):
+                if not mask >> i & 1:
+                    matched &= ~term_bits
+            if not matched:
+                continue
+            # 이 패턴의 문서는 패턴 밖 상위 토큰을 갖지 않으므로 패턴 토큰과 나머지 토큰만 본다.
+            scoring = [s for i, s in enumerate(scorers) if i >= len(bits) or mask >> i & 1]
+            if matched.bit_count() <= SEARCH_PATTERN_WALK:
+                score_all(_positions(matched), scoring)
+                continue
+            # 문서가 많은 패턴은 기여도가 가장 큰 토큰의 impact 순서로 훑다가, 그 토큰의 impact 로 만든 상한이
+            # k 번째 점수 이하가 되면 멈춘다.
+            lead = mask.bit_length() - 1
+            lead_idf, lead_entry = terms[lead]
+            others = upper - maxima[lead] + extra
+            members = matched.to_bytes((matched.bit_length() + 7) >> 3, "little")
+
+            def walk():
+                size = len(members)
+                for o, impact in zip(*lead_entry.ranked):
+                    if len(heap) >= limit and lead_idf * impact + others <= heap[0][0]:
+                        return
+                    if o >> 3 < size and members[o >> 3] >> (o & 7) & 1:
+                        yield o
+
+            score_all(walk(), scoring)
+
+        if rest and (len(heap) < limit or extra > heap[0][0]):
+            # 상위 토큰이 하나도 없고 나머지 토큰만 가진 문서도 k 번째 점수를 넘을 수 있는 경우 (드묾)
+            matched = 0
+            for _, entry in rest:
+                matched |= entry.bits if entry.bits is not None else self._bitmap(entry.docs)
+            for term_bits in bits:
+                matched &= ~term_bits
+            score_all(_positions(matched & valid), scorers[len(bits):])
+        return heap
+
+    def search_exhaustive(self, query: str, limit: int = 20, kinds: set[str] | None = None) -> list[tuple[SearchDoc, float]]:
+        """모든 posting 을 tf 로부터 직접 채점하는 기준 구현. `search` 의 결과 검증용 (느리다)."""
+        norm = BM25_K1 * (1 - BM25_B)
+        scale = BM25_K1 * BM25_B / self._avgdl
+        scores: dict[int, float] = {}
+        for idf, entry in self._terms(query):
+            for o, tf in zip(entry.docs, entry.tfs):
+                scores[o] = scores.get(o, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm + scale * self._doc_len[o])
+        docs = self._docs
+        hits = (
+            (score, o) for o, score in scores.items()
+            if docs[o] is not None and (not kinds or docs[o].kind in kinds)
+        )
+        return [(docs[o], score) for score, o in heapq.nlargest(limit, hits)]
+
+
+def build_index(sources: list[tuple]) -> InvertedIndex:
+    """(문서 생성 함수, 컬럼 행 목록) 들로 새 색인을 만든다. 이벤트 루프를 막지 않도록 스레드에서 호출."""
+    index = InvertedIndex()
+    # 임시 객체가 많아 전체 GC 가 자주 돌면서 GIL 을 오래 잡으므로 구축하는 동안만 끈다.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for make, rows in sources:
+            for row in rows:
+                index.add(*make(*row))
+        index.freeze()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return index
+
+
+class SearchIndex:
+    """현재 색인을 들고 있다가 재구축이 끝나면 통째로 교체한다 (재구축 중에도 이전 색인으로 검색)."""
+
+    def __init__(self):
+        self.ready = False
+        self._index = InvertedIndex()
+        self._lock = asyncio.Lock()
+        # 재구축 중에 들어온 ORM 변경. 새 색인으로 교체하기 전에 다시 적용한다.
+        self._replay: list[tuple] | None = None
+        self._versions: tuple[int, ...] | None = None  # 현재 색인을 만들 때 읽은 catalog_versions
+        self._refresh: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, doc: SearchDoc, text: str):
+        if self.ready:
+            self._index.add(doc, text)
+        if self._replay is not None:
+            self._replay.append((doc, text))
+
+    def remove(self, key: DocKey):
+        if self.ready:
+            self._index.remove(key)
+        if self._replay is not None:
+            self._replay.append((key,))
+
+    def reset(self):
+        """다음 검색 때 DB 에서 전체 재구축하도록 표시."""
+        self.ready = False
+        self._index = InvertedIndex()
+
+    def search(self, query: str, limit: int = 20, kinds: set[str] | None = None) -> list[tuple[SearchDoc, float]]:
+        return self._index.search(query, limit, kinds)
+
+    async def rebuild(self, session: AsyncSession):
+        self._replay = []
+        try:
+            sources = []
+            for _, columns, make in _SOURCES:
+                sources.append((make, (await session.execute(select(*columns))).all()))
+            index = await asyncio.to_thread(build_index, sources)
+            for change in self._replay:
+                if len(change) == 1:
+                    index.remove(*change)
+                else:
+                    index.add(*change)
+            self._index = index
+            self.ready = True
+        finally:
+            self._replay = None
+
+    async def ensure_built(self, session: AsyncSession):
+        """최초에는 색인이 만들어질 때까지 기다리고, 이후 다른 프로세스가 카탈로그를 바꿨으면
+        백그라운드에서 재구축한다 (그동안은 기존 색인으로 응답)."""
+        # 버전을 데이터보다 먼저 읽어야 재구축 도중의 변경을 다음 확인 때 놓치지 않는다.
+        versions = await catalog_versions.get(session, SEARCH_TABLES)
+        if not self.ready:
+            async with self._lock:
+                if not self.ready:
+                    await self.rebuild(session)
+                    self._versions = versions
+            return
+        if versions != self._versions and (self._refresh is None or self._refresh.done()):
+            self._refresh = asyncio.create_task(self._refresh_in_background(versions))
+
+    async def _refresh_in_background(self, versions: tuple[int, ...]):
+        async with self._lock:
+            try:
+                async with SessionLocal() as session:
+                    await self.rebuild(session)
+                self._versions = versions
+                print(f"Search index rebuilt: {len(self)} docs (catalog versions {versions})")
+            except Exception as exc:
+                # 다음 검색 때 버전이 여전히 다르므로 다시 시도된다.
+                print(f"Search index rebuild failed: {exc}")
+
+
+search_index = SearchIndex()
+
+
+# --- ORM 변경 추적: flush 시점에 스냅샷을 모아 두고 commit 이 성공하면 색인에 반영 ---
+
+_PENDING_KEY = "search_index_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in session.deleted:
+        found = _doc_for(obj)
+        if found:
+            doc, _ = found
+            pending[(doc.kind, doc.id)] = None
+    for obj in (*session.new, *session.dirty):
+        found = _doc_for(obj)
+        if found:
+            doc, text = found
+            pending[(doc.kind, doc.id)] = (doc, text)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for key, change in pending.items():
+        if change is None:
+            search_index.remove(key)
+        else:
+            search_index.add(*change)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def check(queries: list[str], limit: int) -> int:
+    """DB 에서 색인을 만들어 `search` 결과를 전체 채점(`search_exhaustive`)과 비교한다. 불일치 질의 수를 반환."""
+    index = SearchIndex()
+    async with SessionLocal() as session:
+        await index.rebuild(session)
+    index = index._index
+    if not queries:
+        # 질의를 주지 않으면 posting 이 긴 토큰들을 섞어 만든다 (조기 종료가 일어나는 경우).
+        common = sorted(index._postings, key=lambda t: len(index._postings[t].docs), reverse=True)[:40]
+        queries = [" ".join(common[i:i + n]) for n in (1, 2, 3, 5) for i in range(0, len(common) - n, n)]
+    failed = 0
+    for query in queries:
+        for kinds in (None, {"event"}, {"annotation", "element"}):
+            got = [round(score, 9) for _, score in index.search(query, limit, kinds)]
+            want = [round(score, 9) for _, score in index.search_exhaustive(query, limit, kinds)]
+            if got != want:
+                failed += 1
+                print(f"MISMATCH {query!r} kinds={kinds}: {got[:5]} != {want[:5]}")
+    print(f"checked {len(queries)} queries on {len(index)} docs: {failed} mismatches")
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="검색 결과를 전체 채점 결과와 비교 (정확한 top-k 확인)")
+    parser.add_argument("queries", nargs="*", help="확인할 질의 (생략하면 흔한 토큰으로 만든다)")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(check(args.queries, args.limit)) else 0)
@@ -1,3 +1,4 @@
+import hashlib
 from pathlib import Path
 from app.core.config import settings
 
@@ -12,3 +13,11 @@ def ensure_subdir(name: str) -> Path:
     target = storage_root() / name
     target.mkdir(parents=True, exist_ok=True)
     return target
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
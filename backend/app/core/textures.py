@@ -0,0 +1,235 @@
+"""익스포트된 GLB 의 임베디드 텍스처 축소/재인코딩.
+
+블렌더 glTF 익스포터는 원본 텍스처(4K/8K PNG 등)를 그대로 GLB 에 넣는다. 익스포트 후 이 단계에서
+bufferView 에 들어 있는 이미지를 `TEXTURE_MAX_SIZE` 이하로 줄이고, 알파가 없는 색상 텍스처(baseColor,
+emissive 등)는 `TEXTURE_FORMAT`(webp/jpeg)으로 다시 인코딩한 뒤 BIN 청크와 bufferView 오프셋을 다시 쓴다.
+노멀/metallicRoughness/occlusion 같은 데이터 텍스처는 크기만 줄이고 무손실을 유지한다.
+
+결과는 `DATA_DIR/textures/{원본 이미지 sha256}-{설정 키}-{lossy|lossless}.{ext}` 에 캐시하므로 여러 씬이 공유하는
+텍스처는 한 번만 처리한다. 줄여도 작아지지 않는 이미지는 `.skip` 마커만 남기고 원본을 유지한다.
+"""
+import hashlib
+import io
+from pathlib import Path
+from uuid import uuid4
+
+from PIL import Image
+
+from app.core.config import settings
+from app.core.glb import GLBError, read_glb, write_glb
+from app.core.storage import ensure_subdir
+
+TEXTURE_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+WEBP_EXTENSION = "EXT_texture_webp"
+
+# sRGB 색상 텍스처 — 손실 압축 가능. 그 외(normal, metallicRoughness, occlusion, 확장 재질의 데이터 맵)는 무손실.
+COLOR_TEXTURE_KEYS = {"baseColorTexture", "emissiveTexture", "diffuseTexture", "sheenColorTexture", "specularColorTexture"}
+
+
+def texture_settings_key() -> str:
+    return f"{settings.TEXTURE_MAX_SIZE}-{settings.TEXTURE_FORMAT}-q{settings.TEXTURE_QUALITY}"
+
+
+def _has_alpha(img: Image.Image) -> bool:
+    if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+        alpha = img.convert("RGBA").getchannel("A")
+        return alpha.getextrema()[0] < 255
+    return False
+
+
+def _encode_texture(data: bytes, lossy: bool) -> tuple[bytes, str] | None:
+    """(인코딩된 바이트, mimeType) 또는 원본 유지가 나으면 None.
+
+    lossy=False 인 데이터 텍스처(노멀, metallicRoughness, occlusion 등)는 손실 압축 아티팩트가 셰이딩에
+    그대로 드러나므로 크기만 줄이고 PNG 를 유지한다. 원본이 이미 JPEG/WebP 면 같은 포맷으로 줄인다.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        original_format = img.format
+        has_alpha = _has_alpha(img)
+        resized = max(img.size) > settings.TEXTURE_MAX_SIZE
+        # 줄일 필요가 없으면 알파/데이터 텍스처나 이미 손실 압축된 이미지는 그대로 둔다
+        if not resized and (has_alpha or not lossy or original_format in ("JPEG", "WEBP")):
+            return None
+        if img.mode not in ("L", "RGB", "RGBA") or (has_alpha and img.mode != "RGBA"):
+            img = img.convert("RGBA" if has_alpha else "RGB")
+        elif img.mode == "RGBA" and not has_alpha:
+            img = img.convert("RGB")
+        if resized:
+            img.thumbnail((settings.TEXTURE_MAX_SIZE, settings.TEXTURE_MAX_SIZE), Image.Resampling.LANCZOS)
+
+    out = io.BytesIO()
+    if has_alpha:
+        # 알파 채널은 JPEG 로 표현할 수 없고, 마스크 경계가 손실 압축에 민감하므로 PNG 유지
+        img.save(out, "PNG", optimize=True)
+        mime = "image/png"
+    elif lossy or original_format in ("JPEG", "WEBP"):
+        pil_format, mime = TEXTURE_FORMATS[settings.TEXTURE_FORMAT if lossy else original_format.lower()]
+        img.save(out, pil_format, quality=settings.TEXTURE_QUALITY, **({"method": 4} if pil_format == "WEBP" else {"optimize": True}))
+    else:
+        img.save(out, "PNG", optimize=True)
+        mime = "image/png"
+    encoded = out.getvalue()
+    # 해상도를 줄였으면 GPU 메모리가 줄어드므로 파일이 조금 커져도 채택한다
+    if not resized and len(encoded) >= len(data):
+        return None
+    return encoded, mime
+
+
+def _cached_texture(data: bytes, lossy: bool) -> tuple[bytes, str] | None:
+    """(source 해시, 설정, 손실 여부) 단위로 결과를 캐시해 _encode_texture 를 호출."""
+    cache_dir = ensure_subdir("textures")
+    stem = f"{hashlib.sha256(data).hexdigest()}-{texture_settings_key()}-{'lossy' if lossy else 'lossless'}"
+    if (cache_dir / f"{stem}.skip").exists():
+        return None
+    for ext, mime in (("webp", "image/webp"), ("jpg", "image/jpeg"), ("png", "image/png")):
+        hit = cache_dir / f"{stem}.{ext}"
+        if hit.exists():
+            return hit.read_bytes(), mime
+
+    try:
+        result = _encode_texture(data, lossy)
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        print(f"Skipping texture {stem[:16]}: {exc}")
+        result = None
+    if result is None:
+        dest = cache_dir / f"{stem}.skip"
+        dest.touch()
+        return None
+    encoded, mime = result
+    ext = {"image/webp": "webp", "image/jpeg": "jpg", "image/png": "png"}[mime]
+    dest = cache_dir / f"{stem}.{ext}"
+    tmp = dest.with_name(f".{uuid4().hex}.{ext}")
+    tmp.write_bytes(encoded)
+    tmp.replace(dest)
+    return result
+
+
+def _color_images(gltf: dict) -> set[int]:
+    """색상 텍스처로만 쓰이는 이미지 인덱스.
+
+    데이터 텍스처로 한 번이라도 쓰이거나 어떤 재질에서도 참조되지 않는 이미지는 여기에 들어가지 않는다
+    (역할을 모르면 무손실로 둔다).
+    """
+    textures = gltf.get("textures", [])
+    color: set[int] = set()
+    data: set[int] = set()
+
+    def sources(tex_idx) -> list[int]:
+        if not isinstance(tex_idx, int) or not 0 <= tex_idx < len(textures) or not isinstance(textures[tex_idx], dict):
+            return []
+        tex = textures[tex_idx]
+        found = [tex.get("source")]
+        found += [ext.get("source") for ext in tex.get("extensions", {}).values() if isinstance(ext, dict)]
+        return [src for src in found if isinstance(src, int)]
+
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key.endswith("Texture") and isinstance(value, dict):
+                    (color if key in COLOR_TEXTURE_KEYS else data).update(sources(value.get("index")))
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(gltf.get("materials", []))
+    return color - data
+
+
+def _check_buffer_views(gltf: dict, images: list, views: list):
+    """다시 쓰기 전에 참조가 모두 유효한지 확인한다."""
+    if not gltf.get("buffers"):
+        raise GLBError("buffers 가 없습니다.")
+    for view in views:
+        if not isinstance(view, dict) or not isinstance(view.get("byteLength"), int) \
+                or not isinstance(view.get("byteOffset", 0), int):
+            raise GLBError("bufferView 의 byteOffset/byteLength 가 올바르지 않습니다.")
+    for image in images:
+        idx = image.get("bufferView") if isinstance(image, dict) else None
+        if not isinstance(image, dict) or (idx is not None and not (isinstance(idx, int) and 0 <= idx < len(views))):
+            raise GLBError(f"image 가 올바르지 않은 bufferView({idx}) 를 참조합니다.")
+
+
+def optimize_glb_textures(path: Path) -> dict:
+    """GLB 의 임베디드 이미지를 줄이고 파일을 다시 쓴다. 바꿀 것이 없으면 파일은 그대로 둔다.
+
+    반환: {bytes_before, bytes_after, images, images_optimized, settings}
+    """
+    bytes_before = path.stat().st_size
+    gltf, bin_chunk = read_glb(path)
+    images = gltf.get("images", [])
+    stats = {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_before,
+        "images": len(images),
+        "images_optimized": 0,
+        "settings": texture_settings_key(),
+    }
+    views = gltf.get("bufferViews", [])
+    if not images or not bin_chunk:
+        return stats
+    _check_buffer_views(gltf, images, views)
+
+    # GLB 의 BIN 청크는 uri 없는 buffers[0] 이다. 그 안의 bufferView 만 다시 배치한다.
+    bin_views = sorted(
+        (i for i, v in enumerate(views) if v.get("buffer", 0) == 0),
+        key=lambda i: views[i].get("byteOffset", 0),
+    )
+    end = 0
+    for i in bin_views:
+        start = views[i].get("byteOffset", 0)
+        if start < end:
+            # 겹치는 bufferView 는 오프셋을 독립적으로 옮길 수 없다
+            return stats
+        end = start + views[i]["byteLength"]
+    if end > len(bin_chunk):
+        raise GLBError("bufferView 가 BIN 청크 범위를 넘어갑니다.")
+
+    replaced: dict[int, bytes] = {}
+    webp_images: set[int] = set()
+    color_images = _color_images(gltf)
+    for idx, image in enumerate(images):
+        view_idx = image.get("bufferView")
+        if view_idx is None:
+            continue
+        # 여러 이미지가 한 bufferView 를 공유하면 건드리지 않는다
+        if sum(1 for img in images if img.get("bufferView") == view_idx) > 1:
+            continue
+        view = views[view_idx]
+        start = view.get("byteOffset", 0)
+        result = _cached_texture(bytes(bin_chunk[start:start + view["byteLength"]]), lossy=idx in color_images)
+        if result is None:
+            continue
+        replaced[view_idx], image["mimeType"] = result
+        stats["images_optimized"] += 1
+        if image["mimeType"] == "image/webp":
+            webp_images.add(idx)
+
+    if not replaced:
+        return stats
+
+    # bufferView 를 원래 순서대로 4바이트 정렬해 다시 채운다 (접근자 오프셋은 view 기준이므로 그대로 유효)
+    out = bytearray()
+    for i in bin_views:
+        view = views[i]
+        start = view.get("byteOffset", 0)
+        data = replaced.get(i, bin_chunk[start:start + view["byteLength"]])
+        out += b"\0" * (-len(out) % 4)
+        view["byteOffset"] = len(out)
+        view["byteLength"] = len(data)
+        out += data
+    gltf["buffers"][0]["byteLength"] = len(out)
+
+    if webp_images:
+        # 코어 glTF 는 PNG/JPEG 만 허용하므로 WebP 텍스처는 EXT_texture_webp 로 참조한다
+        for texture in gltf.get("textures", []):
+            if texture.get("source") in webp_images:
+                texture.setdefault("extensions", {})[WEBP_EXTENSION] = {"source": texture.pop("source")}
+        for key in ("extensionsUsed", "extensionsRequired"):
+            if WEBP_EXTENSION not in gltf.setdefault(key, []):
+                gltf[key].append(WEBP_EXTENSION)
+
+    write_glb(path, gltf, bytes(out))
+    stats["bytes_after"] = path.stat().st_size
+    return stats
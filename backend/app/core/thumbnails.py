@@ -0,0 +1,45 @@
+"""타임라인 카드용 썸네일 생성/캐시.
+
+원본(렌더 PNG 또는 씬 프리뷰 PNG)의 내용 해시를 키로 `DATA_DIR/thumbnails/{hash}/{size}.{fmt}` 에 저장한다.
+같은 해시의 썸네일은 내용이 바뀌지 않으므로 immutable 로 서빙할 수 있다.
+"""
+from pathlib import Path
+from uuid import uuid4
+
+from PIL import Image
+
+from app.core.storage import ensure_subdir
+
+THUMBNAIL_SIZES = (64, 128, 256)
+THUMBNAIL_FORMATS = {"webp": "image/webp", "png": "image/png"}
+PREVIEW_SIZE = max(THUMBNAIL_SIZES)
+
+
+def thumbnail_path(content_hash: str, size: int, fmt: str) -> Path:
+    return ensure_subdir("thumbnails") / content_hash / f"{size}.{fmt}"
+
+
+def has_thumbnails(content_hash: str) -> bool:
+    return all(thumbnail_path(content_hash, size, fmt).exists() for size in THUMBNAIL_SIZES for fmt in THUMBNAIL_FORMATS)
+
+
+def make_thumbnails(source: Path, content_hash: str) -> str:
+    """source 이미지로 모든 크기/포맷 썸네일을 만든다. 이미 있으면 건너뛴다."""
+    if has_thumbnails(content_hash):
+        return content_hash
+    with Image.open(source) as img:
+        img = img.convert("RGBA") if img.mode not in ("RGB", "RGBA") else img.copy()
+    for size in THUMBNAIL_SIZES:
+        thumb = img.copy()
+        thumb.thumbnail((size, size), Image.Resampling.LANCZOS)
+        for fmt in THUMBNAIL_FORMATS:
+            dest = thumbnail_path(content_hash, size, fmt)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            # 다른 워커가 읽는 중에 반쯤 쓰인 파일이 보이지 않도록 임시 파일 후 교체
+            tmp = dest.with_name(f".{uuid4().hex}.{fmt}")
+            if fmt == "webp":
+                thumb.save(tmp, "WEBP", quality=80, method=4)
+            else:
+                thumb.save(tmp, "PNG", optimize=True)
+            tmp.replace(dest)
+    return content_hash
@@ -0,0 +1,237 @@
+"""CSV/JSONL 카탈로그 일괄 import.
+
+    python -m app.db.import epochs epochs.csv
+    python -m app.db.import events events.jsonl --batch-size 5000
+    python -m app.db.import annotations annotations.jsonl
+    python -m app.db.import elements elements.csv
+
+입력은 한 줄씩 스트리밍으로 읽고 pydantic 스키마(`*Import`)로 검증한 뒤,
+배치마다 한 트랜잭션으로 넣는다. epochs 는 `name`, events 는 `title` 기준 업서트
+(MySQL `ON DUPLICATE KEY UPDATE`, SQLite/PostgreSQL `ON CONFLICT DO UPDATE`),
+annotations/elements 는 고유 키가 없어 단순 insert 다.
+
+배치 커밋 후 `DATA_DIR/imports/` 에 처리한 줄 번호를 기록하므로, 중단 후 같은 명령을
+다시 실행하면 이어서 진행한다(`--restart` 로 처음부터). 커밋과 체크포인트 기록 사이에
+죽으면 마지막 배치가 한 번 더 들어갈 수 있는데, 업서트 대상은 영향이 없고
+annotations/elements 는 중복 행이 생길 수 있다.
+
+events/annotations 는 `epoch` 컬럼에 에폭 이름을 쓴다(events 는 `epoch_id` 도 허용).
+공유 응답 캐시(`CACHE_URL`)가 설정돼 있으면 배치마다 영향받은 에폭/이벤트 키를 지운다.
+배치마다 `catalog_versions` 를 올리므로 API 프로세스의 검색 색인/facets 캐시는
+`CATALOG_POLL_SEC` 안에 변경을 알아채고 다시 만든다. 로컬 응답 캐시는 TTL 만료를 기다려야 한다.
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from app.api.epochs import epoch_cache_keys
+from app.api.events import event_cache_keys
+from app.core.cache import response_cache
+from app.core.catalog import bump_catalog_versions
+from app.core.db import engine
+from app.core.storage import ensure_subdir
+from app.db.models import Base, Annotation, CosmicEvent, Element, Epoch
+from app.schemas.elements import ElementImport
+from app.schemas.epochs import AnnotationImport, EpochImport
+from app.schemas.events import CosmicEventImport
+
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    model: type
+    schema: type[BaseModel]
+    key: str | None  # 업서트 기준 고유 컬럼 (없으면 단순 insert)
+
+
+SPECS = {
+    "epochs": ImportSpec(Epoch, EpochImport, "name"),
+    "events": ImportSpec(CosmicEvent, CosmicEventImport, "title"),
+    "annotations": ImportSpec(Annotation, AnnotationImport, None),
+    "elements": ImportSpec(Element, ElementImport, None),
+}
+
+
+def _open_text(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def iter_records(path: Path) -> Iterator[tuple[int, dict | str]]:
+    """(줄 번호, 레코드) 를 스트리밍. CSV 는 dict, JSONL 은 파싱 전 문자열(run 에서 행 단위로 파싱해
+    깨진 줄도 검증 실패처럼 건너뛴다).
+
+    CSV 의 빈 칸(과 짧은 행에서 빠진 칸)은 입력에 없는 컬럼으로 보고 빼므로, 업서트 시 기존 값을 유지한다.
+    """
+    name = path.name.removesuffix(".gz")
+    with _open_text(path) as fh:
+        if name.endswith(".csv"):
+            for line_no, row in enumerate(csv.DictReader(fh), start=1):
+                yield line_no, {k: v for k, v in row.items() if k is not None and v not in ("", None)}
+        else:
+            for line_no, line in enumerate(fh, start=1):
+                if line.strip():
+                    yield line_no, line
+
+
+def _parse_record(raw: dict | str) -> dict:
+    if isinstance(raw, str):
+        return json.loads(raw)
+    return raw
+
+
+def _upsert_statement(dialect: str, spec: ImportSpec, columns: list[str]):
+    table = spec.model.__table__
+    if spec.key is None:
+        return insert(table)
+    update_cols = [c for c in columns if c != spec.key]
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite if dialect == "sqlite" else postgresql).insert(table)
+        return stmt.on_conflict_do_update(index_elements=[spec.key], set_={c: stmt.excluded[c] for c in update_cols})
+    raise SystemExit(f"업서트를 지원하지 않는 DB dialect: {dialect}")
+
+
+class Checkpoint:
+    """입력 파일(경로/크기/수정 시각)별로 마지막으로 커밋한 줄 번호를 기록."""
+
+    def __init__(self, kind: str, path: Path):
+        stat = path.stat()
+        ident = f"{kind}:{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        self.file = ensure_subdir("imports") / f"{hashlib.sha1(ident.encode()).hexdigest()}.json"
+        self.ident = ident
+
+    def load(self) -> int:
+        if not self.file.exists():
+            return 0
+        data = json.loads(self.file.read_text())
+        return data.get("line", 0) if data.get("ident") == self.ident else 0
+
+    def save(self, line: int, done: bool = False):
+        tmp = self.file.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"ident": self.ident, "line": line, "done": done}))
+        tmp.replace(self.file)
+
+    def clear(self):
+        self.file.unlink(missing_ok=True)
+
+
+async def _load_epoch_ids() -> dict[str, int]:
+    async with engine.connect() as conn:
+        return dict((await conn.execute(select(Epoch.name, Epoch.id))).all())
+
+
+def _to_row(kind: str, record: BaseModel, epoch_ids: dict[str, int]) -> dict:
+    # 입력에 없는 컬럼은 업서트 시 기존 값을 덮어쓰지 않도록 제외한다.
+    row = record.model_dump(exclude_unset=True)
+    if kind in ("events", "annotations"):
+        epoch_name = row.pop("epoch", None)
+        if epoch_name is not None:
+            if epoch_name not in epoch_ids:
+                raise ValueError(f"알 수 없는 에폭 이름: {epoch_name}")
+            row["epoch_id"] = epoch_ids[epoch_name]
+    return row
+
+
+async def _invalidate_responses(kind: str, rows: list[dict]):
+    if not response_cache.shared or kind == "elements":
+        return
+    epoch_ids = {row["epoch_id"] for row in rows if row.get("epoch_id")}
+    event_ids: list[int] = []
+    async with engine.connect() as conn:
+        if kind == "epochs":
+            q = select(Epoch.id).where(Epoch.name.in_([row["name"] for row in rows]))
+            epoch_ids.update((await conn.execute(q)).scalars())
+        elif kind == "events":
+            q = select(CosmicEvent.id).where(CosmicEvent.title.in_([row["title"] for row in rows]))
+            event_ids = list((await conn.execute(q)).scalars())
+    keys = [key for i in epoch_ids for key in epoch_cache_keys(i)]
+    keys += [key for i in event_ids for key in event_cache_keys(i)]
+    await response_cache.delete(*keys)
+
+
+async def run(kind: str, path: Path, batch_size: int = 5000, restart: bool = False) -> int:
+    spec = SPECS[kind]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    checkpoint = Checkpoint(kind, path)
+    if restart:
+        checkpoint.clear()
+    resume_from = checkpoint.load()
+    if resume_from:
+        print(f"{kind}: {resume_from}번째 줄까지 처리된 체크포인트에서 재개")
+
+    epoch_ids = await _load_epoch_ids() if kind in ("events", "annotations") else {}
+    dialect = engine.dialect.name
+    started = time.perf_counter()
+    imported = errors = 0
+    batch: list[dict] = []
+    last_line = resume_from
+
+    async def flush(up_to_line: int):
+        nonlocal imported, batch
+        if batch:
+            # 컬럼 구성이 같은 행끼리 묶어야 executemany(다중 VALUES)로 나간다. 보통은 한 그룹.
+            groups: dict[tuple[str, ...], list[dict]] = {}
+            for row in batch:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            async with engine.begin() as conn:
+                for columns, rows in groups.items():
+                    await conn.execute(_upsert_statement(dialect, spec, list(columns)), rows)
+                # API 워커의 검색 색인/facets 가 이 변경을 알아채도록
+                await bump_catalog_versions(conn, spec.model.__tablename__)
+            await _invalidate_responses(kind, batch)
+            imported += len(batch)
+            batch = []
+        checkpoint.save(up_to_line)
+        elapsed = time.perf_counter() - started
+        print(f"{kind}: {imported} rows, line {up_to_line} ({imported / elapsed if elapsed else 0:.0f} rows/s)")
+
+    for line_no, raw in iter_records(path):
+        if line_no <= resume_from:
+            continue
+        last_line = line_no
+        try:
+            batch.append(_to_row(kind, spec.schema.model_validate(_parse_record(raw)), epoch_ids))
+        except (ValidationError, ValueError) as exc:  # json.JSONDecodeError 포함
+            errors += 1
+            if errors <= MAX_REPORTED_ERRORS:
+                print(f"{kind}: line {line_no} 건너뜀: {exc}")
+            continue
+        if len(batch) >= batch_size:
+            await flush(line_no)
+
+    await flush(last_line)
+    checkpoint.save(last_line, done=True)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{kind}: 완료 — {imported} rows in {elapsed:.1f}s "
+        f"({imported / elapsed if elapsed else 0:.0f} rows/s), 오류 {errors}건"
+    )
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV/JSONL 카탈로그 일괄 import")
+    parser.add_argument("kind", choices=sorted(SPECS))
+    parser.add_argument("path", type=Path, help=".csv / .jsonl (.gz 가능)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    args = parser.parse_args()
+    asyncio.run(run(args.kind, args.path, args.batch_size, args.restart))
@@ -1,9 +1,12 @@
-from datetime import datetime
+from datetime import date, datetime
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, Float, ForeignKey, Text, DateTime, Integer, JSON, func
+from sqlalchemy import String, Float, ForeignKey, Text, Date, DateTime, Integer, JSON, Index, UniqueConstraint, func
 
 class Base(DeclarativeBase): pass
 
+# 더 이상 바뀌지 않는 렌더 Job 상태 (보존 기간 정리/캐시 대상)
+RENDER_FINISHED_STATUSES = ("done", "failed")
+
 class Epoch(Base):
     __tablename__ = "epochs"
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -11,7 +14,12 @@ class Epoch(Base):
     start_norm: Mapped[float] = mapped_column(Float)  # 0~1 정규화
     end_norm: Mapped[float] = mapped_column(Float)
     description: Mapped[str | None] = mapped_column(Text)
-    annotations: Mapped[list["Annotation"]] = relationship(back_populates="epoch", cascade="all, delete-orphan")
+    annotations: Mapped[list["Annotation"]] = relationship(
+        back_populates="epoch", cascade="all, delete-orphan", order_by="Annotation.time_mark"
+    )
+    events: Mapped[list["CosmicEvent"]] = relationship(
+        back_populates="epoch", passive_deletes=True, order_by="CosmicEvent.time_norm"
+    )
 
 class Annotation(Base):
     __tablename__ = "annotations"
@@ -26,10 +34,10 @@ class Element(Base):
     __tablename__ = "elements"
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(80), index=True)
-    type: Mapped[str] = mapped_column(String(40))      # quark/atom/star...
+    type: Mapped[str] = mapped_column(String(40), index=True)      # quark/atom/star...
     description: Mapped[str | None] = mapped_column(Text)
     charge_range: Mapped[str | None] = mapped_column(String(40))
-    mass_gev: Mapped[float | None] = mapped_column(Float)
+    mass_gev: Mapped[float | None] = mapped_column(Float, index=True)
     genesis_time: Mapped[str | None] = mapped_column(String(60))
 
 class SceneFile(Base):
@@ -39,6 +47,7 @@ class SceneFile(Base):
     original_name: Mapped[str] = mapped_column(String(255))
     file_path: Mapped[str] = mapped_column(String(255), unique=True)
     file_size: Mapped[int | None] = mapped_column(Integer)
+    content_hash: Mapped[str | None] = mapped_column(String(64), index=True)  # sha256, 썸네일/베이크 캐시 키
     uploaded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     render_jobs: Mapped[list["RenderJob"]] = relationship(back_populates="scene", cascade="all, delete-orphan")
 
@@ -57,6 +66,34 @@ class RenderJob(Base):
 
     scene: Mapped[SceneFile] = relationship(back_populates="render_jobs")
 
+    # 보존 기간 정리 작업이 (status, updated_at) 범위로 스캔한다.
+    __table_args__ = (Index("ix_render_jobs_status_updated_at", "status", "updated_at"),)
+
+
+class RenderJobDaily(Base):
+    """아카이브된 render_jobs 의 일자·씬별 집계 (대시보드/렌더 비용 추정용)."""
+    __tablename__ = "render_job_daily"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    day: Mapped[date] = mapped_column(Date, index=True)
+    scene_id: Mapped[int] = mapped_column(Integer, index=True)  # 씬이 지워져도 집계는 남긴다 (FK 없음)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    done: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    duration_hist: Mapped[list] = mapped_column(JSON)  # DURATION_BUCKETS_SEC 기준 소요 시간 히스토그램
+    p50_sec: Mapped[float | None] = mapped_column(Float)
+    p90_sec: Mapped[float | None] = mapped_column(Float)
+    p99_sec: Mapped[float | None] = mapped_column(Float)
+
+    __table_args__ = (UniqueConstraint("day", "scene_id", name="uq_render_job_daily_day_scene"),)
+
+
+class CatalogVersion(Base):
+    """카탈로그 테이블별 변경 카운터. import CLI/seed 같은 다른 프로세스의 변경을 API 워커가 감지하는 데 쓴다."""
+    __tablename__ = "catalog_versions"
+    name: Mapped[str] = mapped_column(String(40), primary_key=True)  # 테이블 이름
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 
 class CosmicEvent(Base):
     __tablename__ = "cosmic_events"
@@ -69,3 +106,6 @@ class CosmicEvent(Base):
     media_url: Mapped[str | None] = mapped_column(String(255))
     epoch_id: Mapped[int | None] = mapped_column(ForeignKey("epochs.id", ondelete="SET NULL"), nullable=True, index=True)
     default_scene_id: Mapped[int | None] = mapped_column(ForeignKey("scene_files.id", ondelete="SET NULL"), nullable=True)
+
+    epoch: Mapped[Epoch | None] = relationship(back_populates="events")
+    default_scene: Mapped[SceneFile | None] = relationship()
@@ -0,0 +1,163 @@
+"""완료된 render_jobs 보존 기간 정리.
+
+`RENDER_RETENTION_DAYS` 보다 오래된 done/failed Job 을 배치 단위로
+`DATA_DIR/archive/render_jobs/YYYY-MM.jsonl.gz` 에 덧붙이고, 일자·씬별 집계를
+`render_job_daily` 에 합산한 뒤 원본 행을 삭제한다.
+
+    python -m app.db.retention [--days 30] [--batch-size 1000]
+
+배치마다 아카이브 기록 → 집계 합산 + 삭제 커밋 순서이므로, 중간에 죽으면
+마지막 배치가 아카이브에 중복 기록될 수 있다(행은 `id` 로 구분 가능).
+"""
+import argparse
+import asyncio
+import gzip
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import render_job_key, response_cache
+from app.core.config import settings
+from app.core.db import engine, SessionLocal
+from app.core.storage import ensure_subdir
+from app.db.models import Base, RenderJob, RenderJobDaily, RENDER_FINISHED_STATUSES
+
+# 소요 시간 히스토그램 상한(초). 마지막 칸은 그 이상 전부.
+DURATION_BUCKETS_SEC = [1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1200, 1800, 3600]
+
+
+def _bucket_index(seconds: float) -> int:
+    for idx, upper in enumerate(DURATION_BUCKETS_SEC):
+        if seconds <= upper:
+            return idx
+    return len(DURATION_BUCKETS_SEC)
+
+
+def hist_percentile(hist: list[int], q: float) -> float | None:
+    """히스토그램에서 q 분위수를 버킷 상한값으로 근사한다.
+
+    마지막(상한 초과) 칸에 걸리면 마지막 유한 상한값을 반환한다 — "그 이상" 으로 읽는다.
+    inf 는 MySQL FLOAT 에 쓸 수 없고 JSON 응답에서 null 이 되므로 저장하지 않는다.
+    """
+    total = sum(hist)
+    if not total:
+        return None
+    threshold = q * total
+    running = 0
+    for idx, count in enumerate(hist):
+        running += count
+        if running >= threshold:
+            return float(DURATION_BUCKETS_SEC[min(idx, len(DURATION_BUCKETS_SEC) - 1)])
+    return None
+
+
+def _job_record(job: RenderJob) -> dict:
+    return {
+        "id": job.id,
+        "scene_id": job.scene_id,
+        "epoch_id": job.epoch_id,
+        "time_norm": job.time_norm,
+        "status": job.status,
+        "message": job.message,
+        "output_path": job.output_path,
+        "params": job.params,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+def _append_archive(archive_dir: Path, jobs: list[dict]):
+    by_month: dict[str, list[dict]] = defaultdict(list)
+    for rec in jobs:
+        by_month[(rec["created_at"] or "unknown")[:7]].append(rec)
+    for month, records in by_month.items():
+        # gzip 은 멤버를 이어 붙여도 하나의 스트림으로 읽힌다.
+        with gzip.open(archive_dir / f"{month}.jsonl.gz", "at", encoding="utf-8") as fh:
+            for rec in records:
+                fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+async def _merge_rollups(session: AsyncSession, jobs: list[RenderJob]):
+    partial: dict[tuple[date, int], dict] = {}
+    for job in jobs:
+        key = (job.created_at.date(), job.scene_id)
+        agg = partial.setdefault(key, {"total": 0, "done": 0, "failed": 0, "hist": [0] * (len(DURATION_BUCKETS_SEC) + 1)})
+        agg["total"] += 1
+        agg[job.status] += 1
+        if job.status == "done" and job.created_at and job.updated_at:
+            seconds = max((job.updated_at - job.created_at).total_seconds(), 0.0)
+            agg["hist"][_bucket_index(seconds)] += 1
+
+    q = select(RenderJobDaily).where(tuple_(RenderJobDaily.day, RenderJobDaily.scene_id).in_(list(partial)))
+    existing = {(row.day, row.scene_id): row for row in (await session.execute(q)).scalars()}
+
+    for (day, scene_id), agg in partial.items():
+        row = existing.get((day, scene_id))
+        if row is None:
+            row = RenderJobDaily(day=day, scene_id=scene_id, total=0, done=0, failed=0,
+                                 duration_hist=[0] * (len(DURATION_BUCKETS_SEC) + 1))
+            session.add(row)
+        row.total += agg["total"]
+        row.done += agg["done"]
+        row.failed += agg["failed"]
+        hist = [a + b for a, b in zip(row.duration_hist, agg["hist"])]
+        row.duration_hist = hist  # JSON 컬럼은 새 리스트로 교체해야 변경이 감지된다.
+        row.p50_sec = hist_percentile(hist, 0.50)
+        row.p90_sec = hist_percentile(hist, 0.90)
+        row.p99_sec = hist_percentile(hist, 0.99)
+
+
+async def archive_batch(session: AsyncSession, cutoff: datetime, batch_size: int, archive_dir: Path) -> int:
+    """cutoff 이전에 끝난 Job 을 최대 batch_size 개 아카이브/집계/삭제하고 처리한 개수를 반환."""
+    q = (
+        select(RenderJob)
+        .where(RenderJob.status.in_(RENDER_FINISHED_STATUSES), RenderJob.updated_at < cutoff)
+        .order_by(RenderJob.id)
+        .limit(batch_size)
+    )
+    jobs = list((await session.execute(q)).scalars())
+    if not jobs:
+        return 0
+
+    await asyncio.to_thread(_append_archive, archive_dir, [_job_record(job) for job in jobs])
+    await _merge_rollups(session, jobs)
+    ids = [job.id for job in jobs]
+    await session.execute(delete(RenderJob).where(RenderJob.id.in_(ids)))
+    await session.commit()
+    session.expunge_all()
+    # 완료된 Job 은 만료 없이 캐시되므로 공유 캐시에서도 지운다.
+    await response_cache.delete(*(render_job_key(job_id) for job_id in ids))
+    return len(jobs)
+
+
+async def run(days: int | None = None, batch_size: int | None = None) -> int:
+    days = settings.RENDER_RETENTION_DAYS if days is None else days
+    batch_size = batch_size or settings.RENDER_RETENTION_BATCH
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    archive_dir = ensure_subdir("archive/render_jobs")
+
+    # 집계 테이블이 없으면 생성 (seed 와 동일한 안전망)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[RenderJobDaily.__table__])
+
+    archived = 0
+    async with SessionLocal() as s:
+        while True:
+            n = await archive_batch(s, cutoff, batch_size, archive_dir)
+            if not n:
+                break
+            archived += n
+            print(f"archived {archived} render jobs (cutoff {cutoff.isoformat()})")
+    return archived
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오래된 done/failed 렌더 Job 아카이브")
+    parser.add_argument("--days", type=int, default=None, help=f"보존 일수 (기본 {settings.RENDER_RETENTION_DAYS})")
+    parser.add_argument("--batch-size", type=int, default=None, help=f"배치 크기 (기본 {settings.RENDER_RETENTION_BATCH})")
+    args = parser.parse_args()
+    asyncio.run(run(args.days, args.batch_size))
@@ -1,5 +1,6 @@
 import asyncio
 from sqlalchemy import select, func
+from app.core.catalog import bump_catalog_versions
 from app.core.db import engine, SessionLocal
 from app.core.storage import ensure_subdir
 from app.db.models import Base, Epoch, Annotation, Element, CosmicEvent, SceneFile
@@ -53,8 +54,8 @@ async def run():
         if epoch_count == 0:
             bb_id, rc_id = bb.id, rc.id
         else:
-            bb_id = (await s.execute(select(Epoch.id).where(Epoch.name == "Big Bang"))).scalar_one()
-            rc_id = (await s.execute(select(Epoch.id).where(Epoch.name == "Recombination"))).scalar_one()
+            epoch_ids = dict((await s.execute(select(Epoch.name, Epoch.id))).all())
+            bb_id, rc_id = epoch_ids["Big Bang"], epoch_ids["Recombination"]
 
         event_defs = [
             dict(
@@ -107,8 +108,15 @@ async def run():
             ),
         ]
 
+        # 기존 이벤트를 한 번에 조회 (대량 카탈로그는 python -m app.db.import 사용)
+        existing_by_title = {
+            ev.title: ev
+            for ev in (await s.execute(
+                select(CosmicEvent).where(CosmicEvent.title.in_([ed["title"] for ed in event_defs]))
+            )).scalars()
+        }
         for ed in event_defs:
-            existing = (await s.execute(select(CosmicEvent).where(CosmicEvent.title == ed["title"]))).scalar_one_or_none()
+            existing = existing_by_title.get(ed["title"])
             if existing:
                 existing.description = ed["description"]
                 existing.category = ed["category"]
@@ -130,6 +138,7 @@ async def run():
                     )
                 )
 
+        await bump_catalog_versions(s, "epochs", "annotations", "elements", "cosmic_events")
         await s.commit()
 
 if __name__ == "__main__":
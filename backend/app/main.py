@@ -1,13 +1,41 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.db import engine
+from app.core.profiling import ProfilingMiddleware
 
 from app.api.epochs import router as epochs_router
 from app.api.elements import router as elements_router
 from app.api.renders import router as renders_router
 from app.api.events import router as events_router
+from app.api.search import router as search_router
+from app.api.thumbnails import router as thumbnails_router
+from app.api.admin import router as admin_router
+from app import warmup
+
+_import_ms = (time.perf_counter() - _import_started) * 1000
 
-app = FastAPI(title=settings.API_TITLE)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 워밍업은 백그라운드로 돌리고 그동안 /health 는 응답, /ready 는 503
+    task = asyncio.create_task(warmup.run(_import_ms))
+    yield
+    task.cancel()
+    if response_cache.shared:
+        await response_cache.shared.close()
+    await engine.dispose()
+
+app = FastAPI(title=settings.API_TITLE, lifespan=lifespan)
 
 origins = [o.strip() for o in settings.API_ORIGINS.split(",")] if settings.API_ORIGINS else ["*"]
 app.add_middleware(
@@ -17,12 +45,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 가장 바깥에 두어 CORS 를 포함한 요청 전체 시간을 잡는다
+app.add_middleware(ProfilingMiddleware)
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+@app.get("/ready")
+def ready():
+    return JSONResponse(warmup.state.as_dict(), status_code=200 if warmup.state.ready else 503)
+
 app.include_router(epochs_router)
 app.include_router(elements_router)
 app.include_router(renders_router)
 app.include_router(events_router)
+app.include_router(search_router)
+app.include_router(thumbnails_router)
+app.include_router(admin_router)
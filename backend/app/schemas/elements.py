@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 class ElementOut(BaseModel):
     id: int
@@ -9,4 +9,26 @@ class ElementOut(BaseModel):
     mass_gev: float | None = None
     genesis_time: str | None = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MassBucketOut(BaseModel):
+    min_gev: float | None = None  # None 이면 하한 없음
+    max_gev: float | None = None  # None 이면 상한 없음
+    count: int
+
+
+class ElementFacetsOut(BaseModel):
+    total: int
+    types: dict[str, int]
+    mass_buckets: list[MassBucketOut]
+    mass_unknown: int
+
+
+class ElementImport(BaseModel):
+    name: str = Field(..., max_length=80)
+    type: str = Field(..., max_length=40)
+    description: str | None = None
+    charge_range: str | None = Field(default=None, max_length=40)
+    mass_gev: float | None = None
+    genesis_time: str | None = Field(default=None, max_length=60)
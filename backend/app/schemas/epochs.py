@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 class AnnotationOut(BaseModel):
     id: int
@@ -16,4 +16,16 @@ class EpochOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 class EpochDetailOut(EpochOut):
-    annotations: list[AnnotationOut] = []
\ No newline at end of file
+    annotations: list[AnnotationOut] = []
+
+class EpochImport(BaseModel):
+    name: str = Field(..., max_length=80)
+    start_norm: float = Field(..., ge=0.0, le=1.0)
+    end_norm: float = Field(..., ge=0.0, le=1.0)
+    description: str | None = None
+
+class AnnotationImport(BaseModel):
+    epoch: str = Field(..., description="소속 에폭 이름")
+    title: str = Field(..., max_length=120)
+    content: str
+    time_mark: float = Field(..., ge=0.0, le=1.0)
@@ -17,3 +17,11 @@ class CosmicEventOut(CosmicEventBase):
 
 class CosmicEventDetail(CosmicEventOut):
     media_url: str | None = None
+
+
+class CosmicEventImport(CosmicEventBase):
+    title: str = Field(..., max_length=160)
+    category: str | None = Field(default=None, max_length=80)
+    time_range: str | None = Field(default=None, max_length=120)
+    media_url: str | None = Field(default=None, max_length=255)
+    epoch: str | None = Field(default=None, description="epoch_id 대신 에폭 이름으로 지정 (일괄 import 용)")
@@ -0,0 +1,19 @@
+from app.schemas.epochs import EpochOut, AnnotationOut
+from app.schemas.events import CosmicEventOut
+from app.schemas.renders import SceneOut
+
+
+# include= 로 요청한 관계만 채워지고, 요청하지 않은 관계는 null 로 남는다.
+class EpochExpandedOut(EpochOut):
+    annotations: list[AnnotationOut] | None = None
+    events: list[CosmicEventOut] | None = None
+
+
+class CosmicEventExpandedOut(CosmicEventOut):
+    epoch: EpochOut | None = None
+    annotations: list[AnnotationOut] | None = None
+    scene: SceneOut | None = None
+
+
+class CosmicEventExpandedDetail(CosmicEventExpandedOut):
+    media_url: str | None = None
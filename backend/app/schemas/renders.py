@@ -1,5 +1,5 @@
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict, Field
+from datetime import date, datetime
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 
 class SceneOut(BaseModel):
@@ -35,3 +35,35 @@ class RenderJobOut(BaseModel):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RenderManifestOut(BaseModel):
+    job_id: int
+    byte_size: int
+    bin_chunk_size: int
+    node_count: int
+    mesh_count: int
+    mesh_instances: int
+    triangle_count: int
+    material_count: int
+    image_count: int
+    bbox_min: list[float] | None = None
+    bbox_max: list[float] | None = None
+
+
+class RenderDailyOut(BaseModel):
+    day: date
+    scene_id: int
+    total: int
+    done: int
+    failed: int
+    p50_sec: float | None = None
+    p90_sec: float | None = None
+    p99_sec: float | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def success_rate(self) -> float:
+        return self.done / self.total if self.total else 0.0
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+
+class SearchHitOut(BaseModel):
+    type: str = Field(..., description="event / annotation / element")
+    id: int
+    title: str
+    score: float
+    time_norm: float | None = Field(default=None, description="타임라인 이동용 0~1 정규화 시간 (element 는 없음)")
@@ -0,0 +1,142 @@
+"""기동 직후 워밍업과 readiness 상태.
+
+lifespan 에서 백그라운드 태스크로 실행되며, 끝나기 전까지 `/ready` 는 503 을 반환한다.
+필수 단계(스토리지/DB 풀/카탈로그)가 실패하면 (기동 중 DB 가 아직 안 떠 있는 경우 등) 그 단계부터
+백오프하며 성공할 때까지 다시 시도한다 — 그동안 `/ready` 는 `error` 상태의 503.
+각 단계 소요 시간은 `[startup]` 로그로 남겨 import/기동 시간 회귀를 확인할 수 있게 한다.
+"""
+import asyncio
+import shutil
+import subprocess
+import time
+from contextlib import AsyncExitStack
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.api.elements import element_facets
+from app.api.epochs import prime_epoch_cache
+from app.api.events import prime_event_cache
+from app.core.config import settings
+from app.core.db import engine, SessionLocal
+from app.core.search import search_index
+from app.core.storage import ensure_subdir
+
+PRELOAD_LIMIT = 500  # 상세 응답을 미리 캐시할 에폭/이벤트 수 (각각)
+RETRY_INITIAL_SEC = 1.0
+RETRY_MAX_SEC = 30.0
+
+
+class WarmupState:
+    def __init__(self):
+        self.ready = False
+        self.error: str | None = None
+        self.phases: dict[str, float] = {}  # 단계별 소요 시간(ms)
+        self.checks: dict[str, dict] = {}
+        self.retries: dict[str, int] = {}  # 단계별 재시도 횟수
+
+    def as_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else ("error" if self.error else "warming_up"),
+            "error": self.error,
+            "phases_ms": self.phases,
+            "checks": self.checks,
+            "retries": self.retries,
+        }
+
+
+state = WarmupState()
+
+
+async def _phase(name: str, coro):
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        state.phases[name] = round(elapsed, 1)
+        print(f"[startup] {name}: {elapsed:.1f} ms")
+
+
+async def _phase_with_retry(name: str, make_coro):
+    """성공할 때까지 단계를 다시 실행한다 (지수 백오프, 최대 RETRY_MAX_SEC 간격)."""
+    delay = RETRY_INITIAL_SEC
+    while True:
+        try:
+            result = await _phase(name, make_coro())
+        except Exception as exc:
+            state.error = f"{name}: {type(exc).__name__}: {exc}"
+            state.retries[name] = state.retries.get(name, 0) + 1
+            print(f"[startup] {name} failed ({state.error}), retry #{state.retries[name]} in {delay:g}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RETRY_MAX_SEC)
+            continue
+        state.error = None
+        return result
+
+
+async def _open_pool():
+    """커넥션 N 개를 동시에 열었다가 반납해서 풀에 채워 둔다 (핸드셰이크 비용을 첫 요청이 내지 않도록)."""
+    n = max(1, min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+    if not isinstance(engine.pool, QueuePool):
+        n = 1  # StaticPool 등은 커넥션 하나를 공유하므로 미리 열 것이 없다
+    async with AsyncExitStack() as stack:
+        conns = [await stack.enter_async_context(engine.connect()) for _ in range(n)]
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+    state.checks["db"] = {"ok": True, "connections": n}
+
+
+async def _preload_catalog():
+    # 상세 라우트와 같은 쿼리/직렬화 경로로 앞쪽 에폭/이벤트의 상세 응답을 응답 캐시에 넣고
+    # (CACHE_TTL_SEC 동안 유지, 변경 시 기존 무효화 경로로 지워진다), facets 캐시와 검색 색인을 만든다.
+    async with SessionLocal() as s:
+        epochs = await prime_epoch_cache(s, PRELOAD_LIMIT)
+        events = await prime_event_cache(s, PRELOAD_LIMIT)
+        await element_facets(s)
+        await search_index.ensure_built(s)
+    state.checks["catalog"] = {"ok": True, "epochs": epochs, "events": events, "search_docs": len(search_index)}
+
+
+def _check_storage():
+    for name in ("scenes", "renders"):
+        target = ensure_subdir(name)
+        probe = target / f".probe-{uuid4().hex}"
+        probe.write_bytes(b"ok")
+        probe.unlink()
+    state.checks["storage"] = {"ok": True}
+
+
+def _check_blender():
+    blender_bin = settings.BLENDER_BIN or "blender"
+    resolved = shutil.which(blender_bin)
+    if not resolved:
+        state.checks["blender"] = {"ok": False, "detail": f"{blender_bin} 를 찾을 수 없습니다."}
+        return
+    try:
+        result = subprocess.run([resolved, "--version"], capture_output=True, text=True, timeout=60)
+        version = (result.stdout or "").splitlines()[0] if result.stdout else ""
+        state.checks["blender"] = {"ok": result.returncode == 0, "path": resolved, "version": version}
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        state.checks["blender"] = {"ok": False, "path": resolved, "detail": str(exc)}
+
+
+async def run(import_ms: float | None = None):
+    if import_ms is not None:
+        state.phases["import"] = round(import_ms, 1)
+        print(f"[startup] import: {import_ms:.1f} ms")
+    started = time.perf_counter()
+    await _phase_with_retry("storage", lambda: asyncio.to_thread(_check_storage))
+    await _phase_with_retry("db_pool", _open_pool)
+    await _phase_with_retry("catalog", _preload_catalog)
+    # 블렌더는 렌더 작업에만 필요하므로 실패해도 readiness 는 막지 않고 checks 에만 남긴다.
+    try:
+        await _phase("blender", asyncio.to_thread(_check_blender))
+    except Exception as exc:
+        state.checks["blender"] = {"ok": False, "detail": f"{type(exc).__name__}: {exc}"}
+    if not state.checks["blender"]["ok"]:
+        print(f"[startup] warning: blender unavailable: {state.checks['blender']}")
+    state.ready = True
+    total = (time.perf_counter() - started) * 1000
+    state.phases["total"] = round(total, 1)
+    print(f"[startup] warm-up done in {total:.1f} ms")